@@ -75,5 +75,35 @@ class TestChaosResilience(unittest.IsolatedAsyncioTestCase):
         except Exception as e:
             self.fail(f"Bot crashed on DB failure: {e}")
 
+    async def test_unreadable_db_rejects_watch(self):
+        """
+        A corrupt DB file must not be silently replaced by an empty one:
+        /watch reports the error instead of claiming success.
+        """
+        import tempfile
+        from database import AtomicDatabaseManager, DatabaseReadError
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = Path(tmp) / "db.json"
+            db_path.write_text("{not json")
+            bot = WebDogBot()
+            bot.db_manager = AtomicDatabaseManager(db_path)
+            
+            with self.assertRaises(DatabaseReadError):
+                await bot.db_manager.load_all_monitors()
+            
+            bot.request_manager.fetch = AsyncMock(return_value=MagicMock(content="<html>ok</html>", error=None, status_code=200))
+            update = MagicMock()
+            update.effective_chat.id = 1
+            update.message.reply_text = AsyncMock()
+            context = MagicMock()
+            context.args = ["https://ok.com"]
+            context.bot.edit_message_text = AsyncMock()
+            
+            await bot.cmd_watch(update, context)
+            
+            self.assertIn("Error", context.bot.edit_message_text.call_args.kwargs["text"])
+            self.assertEqual(db_path.read_text(), "{not json")
+
 if __name__ == '__main__':
     unittest.main()
@@ -1,4 +1,5 @@
 import unittest
+import dataclasses
 import logging
 import sys
 import copy
@@ -8,6 +9,8 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).resolve().parent.parent / "webdog_bot"))
 
 from models import Config, Monitor, UserData, WeightedFingerprint
+from models import ForensicSnapshot, HistoryEntry, utcnow_iso
+from datetime import datetime, timezone
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("ConfigTest")
@@ -60,6 +63,52 @@ class TestConfig(unittest.TestCase):
         m_loaded = Monitor.from_dict(data)
         self.assertIsNotNone(m_loaded.config)
         self.assertEqual(m_loaded.config.check_interval, 300)
+        
+    def test_to_dict_matches_asdict(self):
+        logger.info("Test 3b: Hand-written to_dict covers every field")
+        m = Monitor(
+            url="full.com",
+            fingerprint=WeightedFingerprint(hash="h", content_weights={"p": 2.0}, structure_signature="sig"),
+            forensic_snapshots=[ForensicSnapshot.create("<p>x</p>")],
+            history_log=[HistoryEntry("2024-01-01T00:00:00+00:00", "CHANGE", 0.5, "Alerted")],
+            history_archive=["abc"],
+            config=Config(check_interval=120),
+        )
+        m.metadata.etag = '"v1"'
+        ud = UserData(user_config=Config(similarity_threshold=0.9), monitors=[m])
+        
+        self.assertEqual(ud.to_dict(), dataclasses.asdict(ud))
+
+    def test_fingerprint_ignores_unknown_keys(self):
+        logger.info("Test 3c: Stored fingerprints with retired keys still load")
+        data = Monitor(url="old.com", fingerprint=WeightedFingerprint(hash="h")).to_dict()
+        data["fingerprint"].update(simhash=7, content_length=9)
+        
+        m = Monitor.from_dict(data)
+        self.assertEqual(m.fingerprint.hash, "h")
+
+    def test_utcnow_iso(self):
+        logger.info("Test 3c: Fast UTC timestamps")
+        stamp = datetime.fromisoformat(utcnow_iso())
+        
+        self.assertEqual(stamp.utcoffset().total_seconds(), 0)
+        self.assertLess(abs((datetime.now(timezone.utc) - stamp).total_seconds()), 2)
+
+    def test_monitor_index(self):
+        logger.info("Test 4: URL Index")
+        ud = UserData()
+        ud.upsert_monitor(Monitor(url="https://a.com"))
+        ud.upsert_monitor(Monitor(url="https://b.com"))
+        ud.upsert_monitor(Monitor(url="https://a.com")) # replaces
+        
+        self.assertEqual(len(ud.monitors), 2)
+        self.assertIs(ud.get_monitor("https://a.com"), ud.monitors[-1])
+        
+        # Index follows direct list reassignment too
+        ud.monitors = [Monitor(url="https://c.com")]
+        self.assertIsNone(ud.get_monitor("https://a.com"))
+        self.assertIsNotNone(ud.remove_monitor("https://c.com"))
+        self.assertEqual(ud.monitors, [])
 
 if __name__ == '__main__':
     unittest.main()
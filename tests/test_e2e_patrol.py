@@ -11,6 +11,7 @@ sys.path.append(str(Path(__file__).resolve().parent.parent / "webdog_bot"))
 from main import WebDogBot
 from models import Monitor, UserData, WeightedFingerprint
 from history_manager import HistoryManager
+import interface
 
 logging.basicConfig(level=logging.ERROR, stream=sys.stdout) # Show us errors!
 logger = logging.getLogger("TestE2E")
@@ -90,5 +91,164 @@ class TestE2EPatrol(unittest.IsolatedAsyncioTestCase):
         
         logger.info("E2E Patrol Test Passed.")
 
+    async def test_alerts_keep_their_keyboards(self):
+        """
+        Several changes for one chat in a tick each arrive with their own action keyboard.
+        """
+        bot = WebDogBot()
+        bot.db_manager.atomic_write = AsyncMock()
+        context = MagicMock()
+        context.bot.send_message = AsyncMock()
+        
+        from governor import get_governor
+        async def fast_send(coro):
+            await coro
+        get_governor().telegram_throttler.send_message = fast_send
+        
+        old_fp = bot.fingerprinter.generate_fingerprint("<html>Old Content</html>")
+        monitors = [Monitor(url=f"https://site{i}.com", fingerprint=old_fp) for i in range(3)]
+        bot.db_manager.load_all_monitors = AsyncMock(return_value={"u": UserData(monitors=monitors)})
+        bot.request_manager.fetch = AsyncMock(return_value=MagicMock(content="<html>New Content</html>", error=None))
+        bot.similarity_engine.calculate_similarity = MagicMock(return_value=MagicMock(final_score=0.0))
+        
+        await bot.patrol_job(context)
+        
+        self.assertEqual(context.bot.send_message.call_count, 3)
+        sent = {c.kwargs['text']: c.kwargs['reply_markup'] for c in context.bot.send_message.call_args_list}
+        for i in range(3):
+            url = f"https://site{i}.com"
+            text = next(t for t in sent if url in t)
+            self.assertEqual(sent[text], interface.get_alert_keyboard(url))
+
+    async def test_removed_during_tick_is_skipped(self):
+        """
+        A monitor deleted by a command while the tick runs is not checked.
+        """
+        bot = WebDogBot()
+        bot.db_manager.atomic_write = AsyncMock()
+        
+        first = Monitor(url="https://host.com/a")
+        second = Monitor(url="https://host.com/b")
+        user_data = UserData(monitors=[first, second])
+        bot.db_manager.load_all_monitors = AsyncMock(return_value={"u": user_data})
+        
+        async def fetch_and_delete(url, **kwargs):
+            user_data.remove_monitor("https://host.com/b") # /unwatch mid-tick
+            return MagicMock(content="<html>Page</html>", error=None)
+        bot.request_manager.fetch = AsyncMock(side_effect=fetch_and_delete)
+        
+        await bot.patrol_job(MagicMock())
+        
+        bot.request_manager.fetch.assert_called_once_with("https://host.com/a")
+        self.assertIsNone(second.fingerprint)
+
+    async def test_not_modified_skips_fingerprint(self):
+        """
+        A monitor with stored validators sends a conditional fetch and
+        a 304 response leaves the baseline untouched.
+        """
+        bot = WebDogBot()
+        bot.db_manager.atomic_write = AsyncMock()
+        bot.fingerprinter.generate_fingerprint = MagicMock()
+        
+        monitor = Monitor(url="https://static-site.com", fingerprint=WeightedFingerprint(hash="abc"))
+        monitor.metadata.etag = '"v1"'
+        bot.db_manager.load_all_monitors = AsyncMock(return_value={"u": UserData(monitors=[monitor])})
+        bot.request_manager.fetch = AsyncMock(return_value=MagicMock(status_code=304, content=None, error=None))
+        
+        await bot.patrol_job(MagicMock())
+        
+        bot.request_manager.fetch.assert_called_once_with("https://static-site.com", etag='"v1"')
+        bot.fingerprinter.generate_fingerprint.assert_not_called()
+        self.assertEqual(monitor.fingerprint.hash, "abc")
+        self.assertIsNotNone(monitor.metadata.last_check)
+
+    async def test_shared_url_fetched_once(self):
+        """
+        Two users watching the same page trigger a single fetch per tick.
+        """
+        bot = WebDogBot()
+        bot.db_manager.atomic_write = AsyncMock()
+        bot.request_manager.fetch = AsyncMock(return_value=MagicMock(content="<html>Same</html>", error=None))
+        
+        m1 = Monitor(url="https://popular.com")
+        m2 = Monitor(url="https://popular.com")
+        data = {"a": UserData(monitors=[m1]), "b": UserData(monitors=[m2])}
+        bot.db_manager.load_all_monitors = AsyncMock(return_value=data)
+        
+        await bot.patrol_job(MagicMock())
+        
+        bot.request_manager.fetch.assert_called_once_with("https://popular.com")
+        self.assertIsNotNone(m1.fingerprint)
+        self.assertIsNotNone(m2.fingerprint)
+
+    async def test_identical_body_skips_fingerprint(self):
+        """
+        A body byte-identical to the last fingerprinted one is not re-parsed.
+        """
+        bot = WebDogBot()
+        monitor = Monitor(url="https://same-bytes.com")
+        user_data = UserData(monitors=[monitor])
+        bot.request_manager.fetch = AsyncMock(return_value=MagicMock(content="<html>Same bytes</html>", error=None))
+        
+        await bot._patrol_monitor(MagicMock(), "u", user_data, monitor)
+        self.assertIsNotNone(monitor.metadata.content_digest)
+        
+        bot.fingerprinter.generate_fingerprint = MagicMock()
+        monitor.metadata.last_check = None
+        await bot._patrol_monitor(MagicMock(), "u", user_data, monitor)
+        bot.fingerprinter.generate_fingerprint.assert_not_called()
+
+    async def test_same_length_text_change_alerts(self):
+        """
+        A same-length text edit (e.g. a price) with unchanged structure alerts.
+        """
+        bot = WebDogBot()
+        body = " ".join(f"paragraph{i % 50} of the quarterly report" for i in range(100))
+        old_fp = bot.fingerprinter.generate_fingerprint(f"<main><p>{body} price 10.00</p></main>")
+        monitor = Monitor(url="https://shop.com", fingerprint=old_fp)
+        user_data = UserData(monitors=[monitor])
+        bot.request_manager.fetch = AsyncMock(return_value=MagicMock(content=f"<main><p>{body} price 12.00</p></main>", error=None))
+        context = MagicMock()
+        context.bot.send_message = AsyncMock()
+        
+        from governor import get_governor
+        async def fast_send(coro):
+            await coro
+        get_governor().telegram_throttler.send_message = fast_send
+        
+        await bot._patrol_monitor(context, "u", user_data, monitor)
+        context.bot.send_message.assert_called_once()
+        self.assertEqual(monitor.history_log[-1].change_type, "CHANGE")
+
+    async def test_unchanged_page_backs_off(self):
+        """
+        Each unchanged check doubles the interval (capped); a change resets it.
+        """
+        bot = WebDogBot()
+        bot.db_manager.atomic_write = AsyncMock()
+        
+        fp = bot.fingerprinter.generate_fingerprint("<html>Stable</html>")
+        monitor = Monitor(url="https://stable.com", fingerprint=fp)
+        user_data = UserData(monitors=[monitor])
+        bot.request_manager.fetch = AsyncMock(return_value=MagicMock(content="<html>Stable</html>", error=None))
+        
+        await bot._patrol_monitor(MagicMock(), "u", user_data, monitor)
+        self.assertEqual(monitor.metadata.adaptive_interval, 120)
+        
+        # Not due yet: no fetch
+        await bot._patrol_monitor(MagicMock(), "u", user_data, monitor)
+        bot.request_manager.fetch.assert_called_once()
+        
+        monitor.metadata.last_check = None
+        monitor.metadata.adaptive_interval = 3000
+        await bot._patrol_monitor(MagicMock(), "u", user_data, monitor)
+        self.assertEqual(monitor.metadata.adaptive_interval, bot.MAX_ADAPTIVE_INTERVAL)
+        
+        monitor.metadata.last_check = None
+        bot.request_manager.fetch.return_value = MagicMock(content="<html>Totally rewritten page</html>", error=None)
+        await bot._patrol_monitor(MagicMock(), "u", user_data, monitor)
+        self.assertIsNone(monitor.metadata.adaptive_interval)
+
 if __name__ == '__main__':
     unittest.main()
@@ -92,5 +92,19 @@ class TestFingerprinter(unittest.TestCase):
         
         logger.info("SUCCESS: Navigation changes ignored, Content changes detected.")
 
+    def test_identical_content_memoized(self):
+        html = "<html><body><main><p>Memoized page content</p></main></body></html>"
+        
+        first = self.fp.generate_fingerprint(html)
+        self.fp._build_fingerprint = lambda _: self.fail("cache miss on identical content")
+        second = self.fp.generate_fingerprint(html)
+        
+        self.assertEqual(first.hash, second.hash)
+        self.assertIsNot(first.content_weights, second.content_weights)
+        
+        # A caller-supplied raw digest hits the same memo entry
+        third = self.fp.generate_fingerprint(html, self.fp.raw_digest(html))
+        self.assertEqual(first.hash, third.hash)
+
 if __name__ == '__main__':
     unittest.main()
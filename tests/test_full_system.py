@@ -4,12 +4,14 @@ import sys
 import asyncio
 import os
 import shutil
+import threading
 from pathlib import Path
 from unittest.mock import MagicMock, AsyncMock, patch
 
 # Adjust path / Import
 sys.path.append(str(Path(__file__).resolve().parent.parent / "webdog_bot"))
 
+import main
 from main import WebDogBot
 from models import Monitor
 
@@ -72,6 +74,60 @@ class TestFullSystem(unittest.IsolatedAsyncioTestCase):
         
         # 7. Check Governor Stop
         # verified implicit by no error
+
+    async def test_callback_routing(self):
+        """
+        Callback data is routed by prefix; URLs keep their underscores.
+        """
+        bot = WebDogBot()
+        bot.export_data = AsyncMock()
+        bot.snooze_monitor = AsyncMock()
+        bot.open_monitor_settings = AsyncMock()
+        update = MagicMock()
+        update.effective_chat.id = 42
+        update.callback_query.answer = AsyncMock()
+        context = MagicMock()
+        context.bot.send_message = AsyncMock()
+        
+        update.callback_query.data = "EXPORT_CSV_https://a.com/x_y"
+        await bot.handle_callback(update, context)
+        bot.export_data.assert_called_once_with(update, context, "https://a.com/x_y", "CSV")
+        
+        update.callback_query.data = "SNOOZE_60_https://a.com/x_y"
+        await bot.handle_callback(update, context)
+        bot.snooze_monitor.assert_called_once_with("42", "https://a.com/x_y", 60)
+        
+        update.callback_query.data = "OPEN_SETTINGS_https://a.com"
+        await bot.handle_callback(update, context)
+        bot.open_monitor_settings.assert_called_once_with(update, "42", "https://a.com")
+        
+        update.callback_query.data = "NOOP"
+        await bot.handle_callback(update, context)
+        
+    async def test_dns_cache_thread_safe(self):
+        """
+        The getaddrinfo cache is hit from resolver threads concurrently.
+        """
+        errors = []
+        
+        def resolve(worker):
+            try:
+                for i in range(2000):
+                    main._patched_getaddrinfo(f"host{worker}-{i}.test", 443)
+            except Exception as e:
+                errors.append(e)
+        
+        with patch.object(main, "_original_getaddrinfo", lambda *args: [args]), \
+             patch.object(main, "DNS_CACHE_MAX_ENTRIES", 64), \
+             patch.dict(main._dns_cache, clear=True):
+            threads = [threading.Thread(target=resolve, args=(n,)) for n in range(16)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            self.assertLessEqual(len(main._dns_cache), 64)
+        
+        self.assertEqual(errors, [])
         
 if __name__ == '__main__':
     unittest.main()
@@ -8,7 +8,7 @@ from pathlib import Path
 # Adjust path / Import
 sys.path.append(str(Path(__file__).resolve().parent.parent / "webdog_bot"))
 
-from governor import RateLimiter, TelegramThrottler, GlobalGovernor
+from governor import RateLimiter, TelegramThrottler, GlobalGovernor, ConcurrencyLimiter
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("GovernanceTest")
@@ -62,5 +62,42 @@ class TestGovernance(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(counter, 20)
         await throttler.stop()
 
+    async def test_telegram_throttler_overlaps_sends(self):
+        throttler = TelegramThrottler(rate_limit=50.0)
+        await throttler.start()
+        
+        async def slow_send():
+            await asyncio.sleep(0.3) # API round-trip
+            
+        start = time.monotonic()
+        for _ in range(10):
+            await throttler.send_message(slow_send())
+        await throttler.queue.join()
+        
+        # Sequential sends would take 3s; concurrent ones finish in ~one round-trip
+        self.assertLess(time.monotonic() - start, 1.0)
+        await throttler.stop()
+
+    async def test_concurrency_limiter_resize(self):
+        logger.info("Test 3: Concurrency Limiter")
+        limiter = ConcurrencyLimiter(cap=2)
+        peak = 0
+        
+        async def work():
+            nonlocal peak
+            async with limiter:
+                peak = max(peak, limiter.active)
+                await asyncio.sleep(0.05)
+                
+        await asyncio.gather(*[work() for _ in range(6)])
+        self.assertEqual(peak, 2)
+        
+        # Raising the cap live admits more holders
+        await limiter.set_cap(4)
+        peak = 0
+        await asyncio.gather(*[work() for _ in range(8)])
+        self.assertEqual(peak, 4)
+        self.assertEqual(limiter.active, 0)
+
 if __name__ == '__main__':
     unittest.main()
@@ -52,6 +52,13 @@ class TestHistory(unittest.TestCase):
         self.assertEqual(len(data), 1)
         self.assertEqual(data[0]['change_type'], "OLD")
         
+        # A later aged-out entry joins the same chunk instead of a new frame
+        m.history_log.insert(0, HistoryEntry(old_ts, "OLDER", 0.0, "Older stuff"))
+        HistoryManager.archive_and_prune(m, days_to_keep=30)
+        self.assertEqual(len(m.history_archive), 1)
+        data = json.loads(zlib.decompress(base64.b64decode(m.history_archive[0])).decode('utf-8'))
+        self.assertEqual([d['change_type'] for d in data], ["OLD", "OLDER"])
+        
     def test_csv_export(self):
         logger.info("Test 2: CSV Export")
         m = Monitor(url="http://export.com")
@@ -64,6 +71,9 @@ class TestHistory(unittest.TestCase):
             content = f.read()
             self.assertIn("Timestamp (UTC)", content)
             self.assertIn("0.50", content)
+        
+        # Concurrent exports of the same URL never share a file
+        self.assertNotEqual(path, HistoryManager.export_to_csv(m))
 
     def tearDown(self):
        if os.path.exists("exports"):
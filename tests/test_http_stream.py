@@ -0,0 +1,121 @@
+import unittest
+import asyncio
+import logging
+import sys
+from pathlib import Path
+from unittest.mock import patch, AsyncMock
+
+import httpx
+
+# Adjust path / Import
+sys.path.append(str(Path(__file__).resolve().parent.parent / "webdog_bot"))
+
+from request_manager import GlobalRequestManager, FetchResult, MAX_BODY_BYTES, MAX_CACHED_RESULTS, MAX_CIRCUITS
+from circuit_breaker import CircuitBreaker
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("HttpStreamTest")
+
+URL = "https://example.com/page"
+
+class TestHttpStream(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.mgr = GlobalRequestManager()
+        await self.mgr.close()
+        self.seen = []
+
+    async def asyncTearDown(self):
+        await self.mgr.close()
+
+    def _serve(self, response_factory):
+        def handler(request: httpx.Request) -> httpx.Response:
+            self.seen.append(request)
+            return response_factory(request)
+        self.mgr._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    async def _get(self, validators=None):
+        cb = CircuitBreaker()
+        return await self.mgr._execute_http_request(URL, URL, cb, validators)
+
+    async def test_not_modified(self):
+        logger.info("Test 1: 304 Not Modified")
+        self._serve(lambda request: httpx.Response(304))
+
+        result = await self._get({"If-None-Match": '"v1"'})
+
+        self.assertEqual(result.status_code, 304)
+        self.assertIsNone(result.content)
+        self.assertIsNone(result.error)
+
+    async def test_validator_headers_sent(self):
+        logger.info("Test 2: Validator Headers")
+        self._serve(lambda request: httpx.Response(
+            200, text="ok", headers={"ETag": '"v2"', "Last-Modified": "Wed, 01 Jan 2025 00:00:00 GMT"}
+        ))
+        validators = {"If-None-Match": '"v1"', "If-Modified-Since": "Tue, 31 Dec 2024 00:00:00 GMT"}
+
+        result = await self._get(validators)
+
+        sent = self.seen[0].headers
+        self.assertEqual(sent["If-None-Match"], '"v1"')
+        self.assertEqual(sent["If-Modified-Since"], "Tue, 31 Dec 2024 00:00:00 GMT")
+        self.assertEqual(result.etag, '"v2"')
+        self.assertEqual(result.last_modified, "Wed, 01 Jan 2025 00:00:00 GMT")
+
+    async def test_oversize_body_truncated(self):
+        logger.info("Test 3: Oversize Truncation")
+        self._serve(lambda request: httpx.Response(200, content=b"a" * (MAX_BODY_BYTES + 4096)))
+
+        result = await self._get()
+
+        self.assertEqual(result.status_code, 200)
+        self.assertEqual(len(result.content), MAX_BODY_BYTES)
+
+    async def test_unknown_charset_falls_back(self):
+        logger.info("Test 4: Unknown Charset")
+        self._serve(lambda request: httpx.Response(
+            200, content="café".encode("utf-8"), headers={"Content-Type": "text/html; charset=bogus"}
+        ))
+
+        result = await self._get()
+
+        self.assertEqual(result.content, "café")
+
+    async def test_caches_bounded(self):
+        logger.info("Test 5: Bounded Caches")
+        for i in range(MAX_CACHED_RESULTS + 10):
+            self.mgr._cache_result(f"{URL}?p={i}", FetchResult(URL, "ok", 200))
+        for i in range(MAX_CIRCUITS + 10):
+            self.mgr._get_circuit(f"k{i}")
+
+        self.assertEqual(len(self.mgr._cache), MAX_CACHED_RESULTS)
+        self.assertNotIn(f"{URL}?p=0", self.mgr._cache)
+        self.assertEqual(len(self.mgr._circuits), MAX_CIRCUITS)
+        self.assertNotIn("k0", self.mgr._circuits)
+
+    async def test_robots_single_flight(self):
+        logger.info("Test 6: Robots.txt Single-Flight")
+        self._serve(lambda request: httpx.Response(200, text="User-agent: *\nDisallow: /private"))
+
+        results = await asyncio.gather(
+            *(self.mgr.can_fetch(f"https://example.com/{p}") for p in ("a", "b", "private/x"))
+        )
+
+        self.assertEqual(results, [True, True, False])
+        self.assertEqual(len(self.seen), 1)
+        self.assertEqual(self.mgr._robots_inflight, {})
+
+    async def test_cache_hit_skips_jitter(self):
+        logger.info("Test 7: Cache Hit Without Jitter")
+        cached = FetchResult(URL, "ok", 200)
+        self.mgr._cache_result(URL, cached)
+
+        with patch("request_manager.asyncio.sleep", new_callable=AsyncMock) as sleep:
+            result = await self.mgr.fetch(URL)
+
+        self.assertIs(result, cached)
+        sleep.assert_not_awaited()
+
+if __name__ == '__main__':
+    unittest.main()
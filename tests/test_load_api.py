@@ -6,6 +6,8 @@ import time
 from unittest.mock import MagicMock, AsyncMock, patch
 from pathlib import Path
 
+import httpx
+
 # Adjust path / Import
 sys.path.append(str(Path(__file__).resolve().parent.parent / "webdog_bot"))
 
@@ -26,9 +28,13 @@ class TestLoadAPI(unittest.IsolatedAsyncioTestCase):
         bot = WebDogBot()
         await bot.request_manager.startup() # FIX: Initialize Request Manager
         
-        # Mock Fetch to be instant
-        bot.request_manager._client.get = AsyncMock()
-        bot.request_manager._client.get.return_value = MagicMock(status_code=200, text="ok")
+        # Serve every request instantly (robots.txt -> 404 = allow all)
+        def handler(request):
+            if request.url.path == "/robots.txt":
+                return httpx.Response(404)
+            return httpx.Response(200, text="ok")
+        await bot.request_manager.close()
+        bot.request_manager._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
         
         start = time.time()
         
@@ -36,7 +42,8 @@ class TestLoadAPI(unittest.IsolatedAsyncioTestCase):
         for i in range(20):
             tasks.append(bot.request_manager.fetch(f"http://site-{i}.com"))
             
-        await asyncio.gather(*tasks)
+        results = await asyncio.gather(*tasks)
+        self.assertTrue(all(r.status_code == 200 for r in results))
         
         await bot.request_manager.close() # Cleanup
         
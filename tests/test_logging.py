@@ -10,7 +10,7 @@ import sys
 # Adjust path / Import
 sys.path.append(str(Path(__file__).resolve().parent.parent / "webdog_bot"))
 
-from logger import setup_logging, set_correlation_id, get_correlation_id
+from logger import setup_logging, stop_logging, set_correlation_id, get_correlation_id
 
 class TestStructuredLogging(unittest.TestCase):
     
@@ -25,9 +25,12 @@ class TestStructuredLogging(unittest.TestCase):
         
     def tearDown(self):
         # Close handlers to release file lock
+        stop_logging()
         logging.shutdown()
         
     def read_last_log_line(self) -> dict:
+        # Records are written by a background listener; drain it first
+        stop_logging()
         with open(self.TEST_LOG_FILE, "r", encoding="utf-8") as f:
             lines = f.readlines()
             return json.loads(lines[-1])
@@ -3,6 +3,7 @@ import logging
 import time
 import sys
 from pathlib import Path
+from unittest.mock import patch
 
 # Adjust path / Import
 sys.path.append(str(Path(__file__).resolve().parent.parent / "webdog_bot"))
@@ -56,6 +57,36 @@ class TestMetrics(unittest.TestCase):
         logger.info(f"Alerts: {alerts}")
         self.assertTrue(any("Success rate below 80%" in a for a in alerts))
 
+    def test_window_rolls_over(self):
+        logger.info("Test 3b: 24h Window Roll-over")
+        start = 1_700_000_000.0
+        with patch("metrics.time.time", return_value=start):
+            MetricsTracker._instance = None
+            self.tracker = get_metrics_tracker()
+            self.tracker.record_request(0.1, False)
+        
+        # Same ring slot, one day later: the old hour is recycled
+        with patch("metrics.time.time", return_value=start + 24 * 3600):
+            self.tracker.record_request(0.1, True)
+            perf = self.tracker.get_system_status()["performance"]
+        
+        self.assertEqual(perf["total_requests_24h"], 1)
+        self.assertAlmostEqual(perf["success_rate_24h_percent"], 100.0)
+        
+        # Idle for over a day: the running totals age out without new requests
+        with patch("metrics.time.time", return_value=start + 49 * 3600):
+            perf = self.tracker.get_system_status()["performance"]
+        self.assertEqual(perf["total_requests_24h"], 0)
+
+    def test_disk_usage_cached(self):
+        logger.info("Test 3c: Disk Probe Cached")
+        with patch("metrics.shutil.disk_usage", return_value=(0, 0, 2048 * 1024 * 1024)) as probe:
+            self.tracker.get_system_status()
+            status = self.tracker.get_system_status()
+        
+        probe.assert_called_once()
+        self.assertEqual(status["system"]["disk_free_mb"], 2048)
+
     def test_worker_stats(self):
         logger.info("Test 3: Worker Stats")
         self.tracker.update_worker_stats(5, 10)
@@ -103,5 +103,37 @@ class TestSimilarityEngine(unittest.TestCase):
         
         logger.info("SUCCESS: Threshold logic verified.")
 
+    def test_case_4_identical_content(self):
+        logger.info("Test Case 4: Identical Content")
+        
+        text = "Nothing changed on this page."
+        html = "<div><p>Nothing changed</p></div>"
+        
+        metrics = self.engine.compare_content(text, text, html, html)
+        
+        self.assertEqual(metrics.final_score, 1.0)
+        self.assertEqual(self.engine.compute_levenshtein(text, text), 1.0)
+        # Same result the full comparison path produces
+        self.assertEqual(metrics.jaccard, self.engine.compute_jaccard(text, text))
+        self.assertEqual(metrics.semantic, self.engine.compute_semantic_structure(html, html))
+
+    def test_case_5_structure_tag_matching(self):
+        logger.info("Test Case 5: Structural Tag Matching")
+        
+        html1 = "<div><p>Text</p></div>"
+        # Case and attributes don't matter; <pre>/<param> are not <p>
+        html2 = "<DIV class='x'><P id=1>Text</P><pre>code</pre><param/></DIV>"
+        
+        self.assertEqual(self.engine.compute_semantic_structure(html1, html2), 1.0)
+        self.assertEqual(self.engine.compute_semantic_structure(html1, "<div><p>a</p><p>b</p></div>"), 0.8)
+
+    def test_case_6_classification_boundaries(self):
+        logger.info("Test Case 6: Classification Boundaries")
+        
+        self.assertEqual(self.engine.classify_change(0.6999), ChangeType.MAJOR_OVERHAUL)
+        self.assertEqual(self.engine.classify_change(0.70), ChangeType.CONTENT_UPDATE)
+        self.assertEqual(self.engine.classify_change(0.9499), ChangeType.CONTENT_UPDATE)
+        self.assertEqual(self.engine.classify_change(0.95), ChangeType.UI_TWEAK)
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,38 @@
+import unittest
+import logging
+import sys
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+# Adjust path / Import
+sys.path.append(str(Path(__file__).resolve().parent.parent / "webdog_bot"))
+
+from httpcore.backends.auto import AutoBackend
+from telegram_request import PinnedHTTPXRequest, PinnedTelegramBackend, TELEGRAM_API_IP
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("TelegramRequestTest")
+
+class TestTelegramRequest(unittest.IsolatedAsyncioTestCase):
+
+    async def test_only_telegram_is_pinned(self):
+        logger.info("Test 1: Telegram host pinned, others untouched")
+        backend = PinnedTelegramBackend()
+        with patch.object(AutoBackend, "connect_tcp", AsyncMock()) as connect:
+            await backend.connect_tcp("api.telegram.org", 443)
+            await backend.connect_tcp("example.com", 443)
+        
+        self.assertEqual(connect.call_args_list[0].args, (TELEGRAM_API_IP, 443))
+        self.assertEqual(connect.call_args_list[1].args, ("example.com", 443))
+
+    async def test_request_uses_pinned_backend(self):
+        logger.info("Test 2: PTB request wired to the pinned backend")
+        request = PinnedHTTPXRequest(connection_pool_size=8)
+        pool = request._client._transport._pool
+        
+        self.assertIsInstance(pool._network_backend, PinnedTelegramBackend)
+        self.assertEqual(pool._max_connections, 8)
+        await request.shutdown()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+import logging
+import sys
+from pathlib import Path
+
+# Adjust path / Import
+sys.path.append(str(Path(__file__).resolve().parent.parent / "webdog_bot"))
+
+from request_manager import GlobalRequestManager, _normalize_url
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("UrlNormalizationTest")
+
+class TestUrlNormalization(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.mgr = GlobalRequestManager()
+
+    async def asyncTearDown(self):
+        await self.mgr.close()
+
+    def test_tracking_params_dropped_and_sorted(self):
+        logger.info("Test 1: Tracking params / ordering")
+        n1 = self.mgr.normalize_url("https://example.com/p?b=2&utm_source=x&a=1")
+        n2 = self.mgr.normalize_url("https://example.com/p?a=1&fbclid=9&b=2")
+        
+        self.assertEqual(n1, n2)
+        self.assertEqual(n1, "https://example.com/p?a=1&b=2")
+
+    def test_only_scheme_and_host_case_folded(self):
+        logger.info("Test 2: Case handling")
+        self.assertEqual(
+            self.mgr.normalize_url("HTTPS://Example.COM/Docs/Page?Q=A"),
+            "https://example.com/Docs/Page?Q=A"
+        )
+        self.assertNotEqual(
+            self.mgr.normalize_url("https://example.com/Page"),
+            self.mgr.normalize_url("https://example.com/page")
+        )
+
+    def test_repeated_keys_keep_order(self):
+        logger.info("Test 3: Repeated keys")
+        self.assertEqual(
+            self.mgr.normalize_url("https://example.com/?tag=z&tag=a&q="),
+            "https://example.com/?q=&tag=z&tag=a"
+        )
+
+    def test_normalization_memoized(self):
+        logger.info("Test 4: Memoized per raw URL")
+        url = "https://memo.example.com/?utm_source=x&a=1"
+        self.mgr.normalize_url(url)
+        hits = _normalize_url.cache_info().hits
+        self.mgr.normalize_url(url)
+        
+        self.assertEqual(_normalize_url.cache_info().hits, hits + 1)
+
+if __name__ == '__main__':
+    unittest.main()
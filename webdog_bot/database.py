@@ -5,19 +5,27 @@ import os
 import shutil
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, List, Optional, Any, Union, Set, Iterable
 import zlib
 import base64
 import time
 from metrics import get_metrics_tracker
 
-from models import UserData, Monitor, WeightedFingerprint, MonitorMetadata, ForensicSnapshot, ChangeType
+from models import UserData, Monitor, WeightedFingerprint, MonitorMetadata, ForensicSnapshot, ChangeType, utcnow_iso
+
+# orjson encodes/decodes several times faster than stdlib json; optional
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # --- Constants & Configuration ---
 DB_VERSION = "2.0"
 MIN_FREE_SPACE_MB = 10
 BACKUP_COUNT = 5
 DB_FILE_NAME = "db.json"
+FLUSH_DEBOUNCE_SECONDS = 0.5 # Max durability lag for mark_dirty() mutations
+BACKUP_INTERVAL_SECONDS = 300 # Min spacing between rolling backups
 
 class InsufficientStorageError(Exception):
     """Raised when disk space is below the safe threshold."""
@@ -27,6 +35,10 @@ class DatabaseWriteError(Exception):
     """Raised when a database write operation fails."""
     pass
 
+class DatabaseReadError(Exception):
+    """Raised when the database file exists but cannot be loaded."""
+    pass
+
 class WriteOperation:
     """Encapsulates a write request for the queue."""
     def __init__(self, data: dict, future: asyncio.Future):
@@ -53,6 +65,25 @@ class AtomicDatabaseManager:
         self.write_queue: asyncio.Queue[WriteOperation] = asyncio.Queue()
         self.write_worker_task: Optional[asyncio.Task] = None
         
+        # In-memory view of the DB. Hydrated by the first load and replaced
+        # by every atomic_write, so reads never re-parse the file.
+        self._cache: Optional[Dict[str, UserData]] = None
+        # Serializes the one-time hydration so concurrent first callers
+        # (patrol + a command at boot) parse the file once
+        self._load_lock = asyncio.Lock()
+        
+        # Per-user JSON rows (encoded bytes) from the last write. Writes that
+        # name the users they touched only re-encode those rows.
+        self._serialized: Dict[str, bytes] = {}
+        
+        # monotonic time of the last rolling backup (None = none this run)
+        self._last_backup: Optional[float] = None
+        
+        # Debounced persistence for interactive mutations (see mark_dirty)
+        self._dirty: Set[str] = set()
+        self._flush_event = asyncio.Event()
+        self.flush_task: Optional[asyncio.Task] = None
+        
         # Initialize Logger
         self.logger = logging.getLogger("AtomicDB")
         
@@ -66,6 +97,8 @@ class AtomicDatabaseManager:
     async def startup(self):
         """Initializes the database manager and starts background workers."""
         self._start_write_worker()
+        if not self.flush_task or self.flush_task.done():
+            self.flush_task = asyncio.create_task(self._flush_loop())
 
 
     def _initialize_empty_db(self):
@@ -88,35 +121,88 @@ class AtomicDatabaseManager:
     async def _write_worker_loop(self):
         """
         Consumer loop that processes write operations sequentially.
+        Every operation carries a full snapshot, so writes that queued up
+        behind a slow disk are coalesced: only the newest snapshot is
+        persisted and all waiting callers are resolved with its outcome.
         """
         while True:
             write_op = await self.write_queue.get()
+            batch = [write_op]
+            while not self.write_queue.empty():
+                batch.append(self.write_queue.get_nowait())
+
             start_time = time.time()
             try:
-                await self._perform_atomic_write(write_op.data)
+                # Last write wins, exactly as if the batch ran one by one
+                await self._perform_atomic_write(batch[-1].data)
                 
                 # Record Metrics
                 duration = time.time() - start_time
                 get_metrics_tracker().record_db_operation(duration)
                 
-                if not write_op.future.done():
-                    write_op.future.set_result(True)
+                for op in batch:
+                    if not op.future.done():
+                        op.future.set_result(True)
             except Exception as e:
                 self.logger.error(f"Critical DB Write Failure: {e}", exc_info=True)
-                if not write_op.future.done():
-                    write_op.future.set_exception(e)
+                for op in batch:
+                    if not op.future.done():
+                        op.future.set_exception(e)
             finally:
-                self.write_queue.task_done()
+                for _ in batch:
+                    self.write_queue.task_done()
+
+    def mark_dirty(self, chat_id: str):
+        """
+        Flags a user's data (in the cached snapshot) as modified.
+        The flush loop persists all dirty users in one atomic_write at most
+        FLUSH_DEBOUNCE_SECONDS later, so commands never wait on disk I/O.
+        """
+        self._dirty.add(chat_id)
+        self._flush_event.set()
+
+    async def _flush_loop(self):
+        """
+        Background task that coalesces mark_dirty() calls into single writes.
+        """
+        while True:
+            await self._flush_event.wait()
+            # Debounce: let a burst of mutations accumulate
+            await asyncio.sleep(FLUSH_DEBOUNCE_SECONDS)
+            await self.flush()
+
+    async def flush(self):
+        """Writes the cached snapshot now if any user is dirty."""
+        self._flush_event.clear()
+        if not self._dirty or self._cache is None:
+            return
+        pending = self._dirty
+        self._dirty = set()
+        try:
+            await self.atomic_write(self._cache, changed=pending)
+        except Exception as e:
+            self.logger.error(f"Debounced flush failed: {e}")
+            # Keep them dirty; the next mutation (or flush) retries
+            self._dirty |= pending
 
     async def load_all_monitors(self) -> Dict[str, UserData]:
         """
         Loads monitors from disk. Handles schema migration if needed.
         Returns a dictionary of chat_id -> UserData objects.
+        After the first load the in-memory copy is returned; callers share
+        it, mutate it and persist it back via atomic_write.
+        Raises DatabaseReadError if the file exists but can't be loaded.
         """
+        if self._cache is not None:
+            return self._cache
+
         if not self.db_path.exists():
-            return {}
+            self._cache = {}
+            return self._cache
 
-        async with asyncio.Lock(): 
+        async with self._load_lock:
+            if self._cache is not None:
+                return self._cache # Hydrated while we waited
             try:
                 loop = asyncio.get_running_loop()
                 raw_payload = await loop.run_in_executor(None, self._read_json_file)
@@ -133,14 +219,19 @@ class AtomicDatabaseManager:
                     # But we are inside a read lock/op. We should spawn a save or just return migrated 
                     # objects and let the app save later. 
                     # SAFE: We return objects. The next write will stick the new version.
+                    self._cache = migrated_data
                     return migrated_data
                 
                 # Deserialization for V2
-                return self._deserialize_v2(data_content)
+                self._cache = self._deserialize_v2(data_content)
+                return self._cache
 
             except Exception as e:
+                # Don't hand out a throwaway {}: mutations on it would be
+                # acknowledged to the user but never persisted (flush needs
+                # the cache), and persisting it would clobber the real file.
                 self.logger.error(f"Failed to load DB: {e}", exc_info=True)
-                return {}
+                raise DatabaseReadError(f"Failed to load DB: {e}") from e
 
     def _deserialize_v2(self, data: dict) -> Dict[str, UserData]:
         """Converts raw V2 JSON dict to UserData objects."""
@@ -207,23 +298,39 @@ class AtomicDatabaseManager:
         return migrated
 
     def _read_json_file(self) -> dict:
-        """Blocking read helper."""
+        """Blocking read helper (runs in the executor)."""
+        if orjson is not None:
+            with open(self.db_path, 'rb') as f:
+                return orjson.loads(f.read())
         with open(self.db_path, 'r', encoding='utf-8') as f:
             return json.load(f)
 
-    async def atomic_write(self, data: Dict[str, UserData]) -> bool:
+    async def atomic_write(self, data: Dict[str, UserData], changed: Optional[Iterable[str]] = None) -> bool:
         """
         Schedule an atomic write operation.
         Args:
             data: Dictionary of {chat_id: UserData object}
+            changed: Optional chat_ids modified since the last write. When
+                given, only those users are re-serialized; the others reuse
+                their cached rows. None re-serializes everything.
         """
         if not self._check_disk_space():
             raise InsufficientStorageError(f"Available disk space is below {MIN_FREE_SPACE_MB}MB.")
 
-        # Serialize Objects to Dictionary for JSON dumping
-        serialized_data = {
-            k: v.to_dict() for k, v in data.items()
-        }
+        # Encode each user to an immutable JSON row now, on the loop, so the
+        # writer thread never sees objects that patrol/commands keep mutating
+        if changed is None:
+            serialized_data = {
+                k: self._encode_user(v) for k, v in data.items()
+            }
+        else:
+            changed = set(changed)
+            serialized_data = {
+                k: (self._serialized[k] if k in self._serialized and k not in changed else self._encode_user(v))
+                for k, v in data.items()
+            }
+        self._serialized = serialized_data
+        self._cache = data
 
         loop = asyncio.get_running_loop()
         future = loop.create_future()
@@ -233,7 +340,17 @@ class AtomicDatabaseManager:
         
         return await future
 
-    async def _perform_atomic_write(self, monitors_data: dict):
+    @staticmethod
+    def _encode_user(user_data: UserData) -> bytes:
+        """
+        Encodes one user to JSON. orjson walks the dataclasses natively in C,
+        skipping the asdict() deep copy; stdlib json is the fallback.
+        """
+        if orjson is not None:
+            return orjson.dumps(user_data)
+        return json.dumps(user_data.to_dict()).encode('utf-8')
+
+    async def _perform_atomic_write(self, monitors_data: Dict[str, bytes]):
         """
         Executes the actual write logic:
         1. Encapsulate in Schema.
@@ -244,23 +361,29 @@ class AtomicDatabaseManager:
         # 1. Structure Data
         final_payload = {
             "schema_version": DB_VERSION,
-            "updated_at": datetime.now(timezone.utc).isoformat(),
+            "updated_at": utcnow_iso(),
             "data": monitors_data
         }
 
-        # 2. Manage Backups
-        self._manage_backups()
-
-        # 3. Write
+        # 2. Manage Backups / 3. Write
+        # Both touch the disk, so they run in the executor rather than the event loop
         temp_file = self.db_path.parent / f"{self.db_path.name}.tmp"
         loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._manage_backups)
         await loop.run_in_executor(None, self._write_to_disk, temp_file, final_payload)
 
     def _write_to_disk(self, temp_file: Path, payload: dict):
-        """Physical write operations."""
+        """Physical write operations (document assembly included, off the event loop)."""
         try:
-            with open(temp_file, 'w', encoding='utf-8') as f:
-                json.dump(payload, f, indent=4)
+            # Splice the pre-encoded user rows into the schema envelope
+            rows = b",".join(
+                json.dumps(chat_id).encode('utf-8') + b":" + row
+                for chat_id, row in payload["data"].items()
+            )
+            envelope = json.dumps({k: v for k, v in payload.items() if k != "data"}).encode('utf-8')
+            encoded = envelope[:-1] + b', "data": {' + rows + b"}}"
+            with open(temp_file, 'wb') as f:
+                f.write(encoded)
                 f.flush()
                 # Force write to physical disk
                 os.fsync(f.fileno())
@@ -286,9 +409,17 @@ class AtomicDatabaseManager:
             return True
 
     def _manage_backups(self):
-        """Creates a backup and maintains the rolling limit of 5."""
+        """
+        Creates a backup and maintains the rolling limit of 5.
+        Backups are spaced BACKUP_INTERVAL_SECONDS apart; copying the whole
+        file before every per-tick write would double the write volume.
+        """
         if not self.db_path.exists():
             return
+        now = time.monotonic()
+        if self._last_backup is not None and now - self._last_backup < BACKUP_INTERVAL_SECONDS:
+            return
+        self._last_backup = now
 
         timestamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
         backup_name = f"{self.db_path.name}.backup_{timestamp}"
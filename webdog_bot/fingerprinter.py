@@ -1,6 +1,8 @@
 import hashlib
 import re
 import logging
+from collections import OrderedDict
+from dataclasses import replace
 from typing import Dict, List, Optional, Union
 from bs4 import BeautifulSoup, Comment, Tag
 
@@ -23,6 +25,9 @@ class VersionedContentFingerprinter:
     """
     
     VERSION = "v2.0"
+    # Identifies the hash function behind `hash`. Fingerprints with a different
+    # algorithm tag are not comparable and must be re-baselined.
+    ALGORITHM = "weighted_semantic_v2_blake2b"
     
     # 1. Block Page Indicators
     BLOCK_INDICATORS = [
@@ -66,8 +71,13 @@ class VersionedContentFingerprinter:
         r'token\s*[:=]\s*[\w-]+'    # Common token pattern
     ]
     
+    # Max number of fingerprints memoized by raw-content digest
+    CACHE_SIZE = 512
+    
     def __init__(self):
         self.noise_regex = re.compile('|'.join(self.NOISE_PATTERNS), re.IGNORECASE)
+        # blake2b(raw html) -> WeightedFingerprint (LRU order)
+        self._cache: "OrderedDict[bytes, WeightedFingerprint]" = OrderedDict()
 
     def is_block_page(self, html: str) -> bool:
         """
@@ -162,9 +172,34 @@ class VersionedContentFingerprinter:
                  
         return " ".join(final_text_parts)
 
-    def generate_fingerprint(self, html: str) -> WeightedFingerprint:
+    @staticmethod
+    def raw_digest(html: str) -> str:
+        """BLAKE2b-128 hex digest of the raw HTML body."""
+        return hashlib.blake2b(html.encode('utf-8'), digest_size=16).hexdigest()
+
+    def generate_fingerprint(self, html: str, digest: Optional[str] = None) -> WeightedFingerprint:
         """
         Main entry point.
+        Identical page bodies (same page for several users, retries) are
+        served from an LRU memo keyed by the raw HTML digest; callers that
+        already hold `raw_digest(html)` pass it in to skip rehashing.
+        """
+        key = digest or self.raw_digest(html)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            # Hand out a copy so callers never share mutable state
+            return replace(cached, content_weights=dict(cached.content_weights))
+        
+        fingerprint = self._build_fingerprint(html)
+        self._cache[key] = fingerprint
+        if len(self._cache) > self.CACHE_SIZE:
+            self._cache.popitem(last=False)
+        return replace(fingerprint, content_weights=dict(fingerprint.content_weights))
+
+    def _build_fingerprint(self, html: str) -> WeightedFingerprint:
+        """
+        Parses, cleans and hashes the page (uncached).
         """
         # 1. Block Detection
         if self.is_block_page(html):
@@ -181,8 +216,8 @@ class VersionedContentFingerprinter:
         # ensuring high quality alerts.
         stable_content = self.extract_weighted_content(soup)
         
-        # 5. Hash
-        content_hash = hashlib.md5(stable_content.encode('utf-8')).hexdigest()
+        # 5. Hash (BLAKE2b-128: faster than MD5 on 64-bit, same hex length)
+        content_hash = hashlib.blake2b(stable_content.encode('utf-8'), digest_size=16).hexdigest()
         
         # 6. Return Data Model
         
@@ -195,7 +230,7 @@ class VersionedContentFingerprinter:
         return WeightedFingerprint(
             hash=content_hash,
             version=self.VERSION,
-            algorithm="weighted_semantic_v2",
+            algorithm=self.ALGORITHM,
             content_weights=tag_counts, 
             structure_signature="" 
         )
@@ -1,7 +1,7 @@
 import asyncio
 import time
 import logging
-from typing import Optional
+from typing import Optional, Set
 
 logger = logging.getLogger("RateGovernor")
 
@@ -40,15 +40,64 @@ class RateLimiter:
                     wait_time = needed / self.rate
                     await asyncio.sleep(wait_time)
 
+class ConcurrencyLimiter:
+    """
+    Caps the number of concurrent holders (like a Semaphore), but the cap
+    can be changed at runtime via set_cap() without touching private state.
+    Usage: async with limiter: ...
+    """
+    def __init__(self, cap: int):
+        self._cap = max(1, cap)
+        self._active = 0
+        self._cond = asyncio.Condition()
+        
+    @property
+    def cap(self) -> int:
+        return self._cap
+        
+    @property
+    def active(self) -> int:
+        return self._active
+        
+    async def acquire(self):
+        async with self._cond:
+            await self._cond.wait_for(lambda: self._active < self._cap)
+            self._active += 1
+            
+    async def release(self):
+        async with self._cond:
+            self._active -= 1
+            self._cond.notify(1)
+            
+    async def set_cap(self, cap: int):
+        """
+        Resizes the limit. Raising it wakes waiters immediately; lowering it
+        lets current holders finish and admits no one until below the cap.
+        """
+        async with self._cond:
+            self._cap = max(1, cap)
+            self._cond.notify_all()
+            
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+        
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.release()
+
 class TelegramThrottler:
     """
     Strict 30 msg/s regulator (Global).
     Uses a queue worker to drain messages safely.
+    Sends are paced by the token bucket but run concurrently (up to
+    max_in_flight), so one slow API round-trip doesn't stall the queue.
     """
-    def __init__(self, rate_limit: float = 30.0):
+    def __init__(self, rate_limit: float = 30.0, max_in_flight: int = 25):
         self.queue = asyncio.Queue()
         self.limiter = RateLimiter(rate=rate_limit, capacity=int(rate_limit))
+        self.in_flight = asyncio.Semaphore(max_in_flight)
         self.worker_task: Optional[asyncio.Task] = None
+        self._sends: Set[asyncio.Task] = set()
         
     async def start(self):
         if not self.worker_task:
@@ -63,6 +112,8 @@ class TelegramThrottler:
             except asyncio.CancelledError:
                 pass
             self.worker_task = None
+        for task in list(self._sends):
+            task.cancel()
             
     async def send_message(self, bot_send_coroutine):
         """
@@ -98,12 +149,25 @@ class TelegramThrottler:
             coro = await self.queue.get()
             try:
                 await self.limiter.acquire()
-                # Run the coroutine
-                await coro
-            except Exception as e:
-                logger.error(f"Failed to send throttled message: {e}")
-            finally:
+                await self.in_flight.acquire()
+            except BaseException:
+                coro.close()
                 self.queue.task_done()
+                raise
+            # Dispatch without waiting for the round-trip; the next message
+            # only waits for its rate token.
+            task = asyncio.create_task(self._dispatch(coro))
+            self._sends.add(task)
+            task.add_done_callback(self._sends.discard)
+
+    async def _dispatch(self, coro):
+        try:
+            await coro
+        except Exception as e:
+            logger.error(f"Failed to send throttled message: {e}")
+        finally:
+            self.in_flight.release()
+            self.queue.task_done()
 
 class GlobalGovernor:
     """
@@ -115,6 +179,8 @@ class GlobalGovernor:
         # 5 RPS for scraping (Safe/Ethical default)
         self.web_limiter = RateLimiter(rate=5.0, capacity=5)
         self.telegram_throttler = TelegramThrottler(rate_limit=25.0) # Safety margin below 30
+        # Max monitors checked concurrently by patrol (resizable at runtime)
+        self.patrol_limiter = ConcurrencyLimiter(cap=20)
         
     @classmethod
     def get_instance(cls):
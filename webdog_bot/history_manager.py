@@ -1,19 +1,47 @@
+import base64
 import csv
 import json
 import logging
 import os
+import re
+import time
+import uuid
+import zlib
 from datetime import datetime, timedelta, timezone
 from typing import List, Union
 from pathlib import Path
 
-from models import Monitor, HistoryEntry
+from models import Monitor, HistoryEntry, utcnow_iso
+
+# orjson is a C-accelerated JSON encoder; fall back to stdlib json if absent
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 logger = logging.getLogger("HistoryManager")
 
 # Constants
 EXPORT_DIR = Path("exports")
+# Aged-out entries are appended to the newest archive chunk until it holds this many
+ARCHIVE_CHUNK_ENTRIES = 500
 EXPORT_DIR.mkdir(exist_ok=True)
 
+# URL characters that are unsafe in export filenames, mapped in one pass
+_FILENAME_TABLE = str.maketrans({'/': '_', ':': '_', '?': '_', '#': '_', '&': '_', '=': '_'})
+_UNDERSCORE_RUN = re.compile(r'_+')
+
+def _export_stem(url: str) -> str:
+    """Returns a filesystem-safe file stem for a monitor URL."""
+    return _UNDERSCORE_RUN.sub('_', url.translate(_FILENAME_TABLE))
+
+def _export_path(url: str, ext: str) -> Path:
+    """
+    Returns a fresh export path for a monitor URL. The random token keeps
+    concurrent exports of the same URL from writing to one file.
+    """
+    return EXPORT_DIR / f"{_export_stem(url)}_{uuid.uuid4().hex[:8]}_history.{ext}"
+
 class HistoryManager:
     """
     Manages history retention (pruning) and data export.
@@ -25,7 +53,7 @@ class HistoryManager:
         Adds a new entry and automatically prunes old ones to keep the log healthy.
         """
         entry = HistoryEntry(
-            timestamp=datetime.now(timezone.utc).isoformat(),
+            timestamp=utcnow_iso(),
             change_type=change_type,
             similarity_score=score,
             summary=summary
@@ -65,15 +93,16 @@ class HistoryManager:
         
         if to_archive:
             try:
-                # Serialize list of dicts
-                data_str = json.dumps([e.to_dict() for e in to_archive])
-                # Compress
-                import zlib
-                import base64
-                compressed = zlib.compress(data_str.encode('utf-8'))
-                b64_so = base64.b64encode(compressed).decode('ascii')
-                
-                monitor.history_archive.append(b64_so)
+                # Entries usually age out one or two at a time; merge them into
+                # the newest chunk so the archive isn't one zlib/base64 frame per entry
+                rows = [e.to_dict() for e in to_archive]
+                if monitor.history_archive:
+                    newest = HistoryManager._decode_archive(monitor.history_archive[-1])
+                    if len(newest) + len(rows) <= ARCHIVE_CHUNK_ENTRIES:
+                        monitor.history_archive[-1] = HistoryManager._encode_archive(newest + rows)
+                        rows = None
+                if rows is not None:
+                    monitor.history_archive.append(HistoryManager._encode_archive(rows))
                 logger.info(f"Archived {len(to_archive)} entries for {monitor.url}")
             except Exception as e:
                 logger.error(f"Archival failed: {e}")
@@ -85,13 +114,24 @@ class HistoryManager:
                 
         monitor.history_log = active_log
 
+    @staticmethod
+    def _encode_archive(rows: List[dict]) -> str:
+        """Serializes history rows to a base64 zlib-compressed JSON list."""
+        data = orjson.dumps(rows) if orjson is not None else json.dumps(rows).encode('utf-8')
+        return base64.b64encode(zlib.compress(data)).decode('ascii')
+
+    @staticmethod
+    def _decode_archive(chunk: str) -> List[dict]:
+        """Inverse of _encode_archive."""
+        data = zlib.decompress(base64.b64decode(chunk))
+        return orjson.loads(data) if orjson is not None else json.loads(data)
+
     @staticmethod
     def export_to_csv(monitor: Monitor) -> str:
         """
         Generates a CSV file and returns the path.
         """
-        filename = f"{monitor.url.replace('://', '_').replace('/', '_')}_history.csv"
-        filepath = EXPORT_DIR / filename
+        filepath = _export_path(monitor.url, "csv")
         
         try:
             with open(filepath, 'w', newline='', encoding='utf-8') as csvfile:
@@ -115,18 +155,22 @@ class HistoryManager:
         """
         Generates a JSON file and returns the path.
         """
-        filename = f"{monitor.url.replace('://', '_').replace('/', '_')}_history.json"
-        filepath = EXPORT_DIR / filename
+        filepath = _export_path(monitor.url, "json")
         
         data = {
             "url": monitor.url,
-            "exported_at": datetime.now(timezone.utc).isoformat(),
+            "exported_at": utcnow_iso(),
             "history": [entry.to_dict() for entry in monitor.history_log]
         }
         
         try:
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2)
+            if orjson is not None:
+                # One C-level encode and a single bytes write
+                with open(filepath, 'wb') as f:
+                    f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+            else:
+                with open(filepath, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, indent=2)
             return str(filepath)
         except Exception as e:
             logger.error(f"JSON Export failed: {e}")
@@ -138,13 +182,14 @@ class HistoryManager:
         Deletes files in export directory older than max_age_minutes.
         """
         try:
-            cutoff = datetime.now() - timedelta(minutes=max_age_minutes)
+            cutoff = time.time() - max_age_minutes * 60
             count = 0
-            for file in EXPORT_DIR.glob("*"):
-                if file.is_file():
-                    mtime = datetime.fromtimestamp(file.stat().st_mtime)
-                    if mtime < cutoff:
-                        file.unlink()
+            # scandir gets the file type from the directory listing itself;
+            # mtimes are compared as plain floats
+            with os.scandir(EXPORT_DIR) as entries:
+                for entry in entries:
+                    if entry.is_file(follow_symlinks=False) and entry.stat().st_mtime < cutoff:
+                        os.unlink(entry.path)
                         count += 1
             if count > 0:
                 logger.info(f"Cleaned up {count} old export files.")
@@ -1,5 +1,6 @@
 import logging
 import math
+from functools import lru_cache
 from typing import List, Optional
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Update
 from telegram.ext import ContextTypes
@@ -9,9 +10,11 @@ ITEMS_PER_PAGE = 5
 
 logger = logging.getLogger("Interface")
 
+@lru_cache(maxsize=None)
 def get_main_menu_keyboard() -> InlineKeyboardMarkup:
     """
     Returns the primary dashboard menu.
+    Built once; markups are immutable, so the same instance is reused.
     """
     keyboard = [
         [
@@ -75,6 +78,7 @@ def get_monitor_list_keyboard(monitors: list, page: int = 0) -> InlineKeyboardMa
     
     return InlineKeyboardMarkup(keyboard)
 
+@lru_cache(maxsize=512)
 def get_alert_keyboard(url: str) -> InlineKeyboardMarkup:
     """
     Actions for checking an alert.
@@ -102,10 +106,14 @@ def get_settings_keyboard(config: Config, context_id: str = "GLOBAL") -> InlineK
     Generates settings menu. 
     context_id is "GLOBAL" or a URL string.
     """
-    # Formatting
-    thresh_pct = int(config.similarity_threshold * 100)
-    int_sec = config.check_interval
-    diff_state = "ON" if config.include_diff else "OFF"
+    return _settings_keyboard(int(config.similarity_threshold * 100), config.check_interval, config.include_diff, context_id)
+
+@lru_cache(maxsize=512)
+def _settings_keyboard(thresh_pct: int, int_sec: int, include_diff: bool, context_id: str) -> InlineKeyboardMarkup:
+    """
+    Builds the settings markup; memoized on the displayed values.
+    """
+    diff_state = "ON" if include_diff else "OFF"
     
     keyboard = [
         [
@@ -121,42 +129,51 @@ def get_settings_keyboard(config: Config, context_id: str = "GLOBAL") -> InlineK
     ]
     return InlineKeyboardMarkup(keyboard)
 
-import html
 
 # ... existing imports ...
 
+# Same mapping as html.escape(quote=True), applied in a single C-level pass
+_HTML_ESCAPE_TABLE = str.maketrans({
+    "&": "&amp;",
+    "<": "&lt;",
+    ">": "&gt;",
+    '"': "&quot;",
+    "'": "&#x27;",
+})
+
 def escape_html(text: str) -> str:
     """Helper to escape HTML special characters."""
-    return html.escape(str(text))
+    if not isinstance(text, str):
+        text = str(text)
+    return text.translate(_HTML_ESCAPE_TABLE)
 
 # Alias for strict requirement compliance
 sanitize_html = escape_html
 
+@lru_cache(maxsize=1024)
+def escape_url(url: str) -> str:
+    """escape_html for monitor URLs, which recur in every message about a site."""
+    return escape_html(url)
+
 # ... existing code ...
 
 def format_diff_message(url: str, score: float, classification: str, diff_text: str = "") -> str:
     """
     Formats the alert message with markdown.
     """
-    # Escape for HTML safety
-    safe_url = escape_html(url)
-    safe_class = escape_html(classification)
+    # diff_text should already be truncated by `change_detector` (3000 chars).
+    # Sanitize the diff block content!
+    diff_block = f"\n<pre language='diff'>{escape_html(diff_text)}</pre>" if diff_text else ""
     
-    msg = (
-        f"Change Detected: {safe_url}\n"
+    # Single f-string so the (possibly 3000-char) diff is copied only once
+    return (
+        f"Change Detected: {escape_url(url)}\n"
         f"Similarity: {int(score*100)}%\n"
-        f"Type: <i>{safe_class}</i>\n"
+        f"Type: <i>{escape_html(classification)}</i>\n"
+        f"{diff_block}"
     )
-    
-    if diff_text:
-        # Truncate if MASSIVE even for telegram (max 4096 char msg)
-        # diff_text should already be truncated by `change_detector` (3000 chars).
-        # Sanitize the diff block content!
-        safe_diff = escape_html(diff_text)
-        msg += f"\n<pre language='diff'>{safe_diff}</pre>"
-        
-    return msg
 
+@lru_cache(maxsize=512)
 def get_history_keyboard(url: str) -> InlineKeyboardMarkup:
     """
     Actions for history view.
@@ -1,15 +1,26 @@
 import logging
 import json
+import copy
 import datetime
 import sys
 import os
-from logging.handlers import RotatingFileHandler
+import queue
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
 from contextvars import ContextVar
 from typing import Optional, Any, Dict
 
+# orjson is a C-accelerated JSON encoder; fall back to stdlib json if absent
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Context Var for Correlation ID (e.g. Chat ID)
 _correlation_id_ctx = ContextVar("correlation_id", default=None)
 
+# Background listener draining log records to disk (set by setup_logging)
+_listener: Optional[QueueListener] = None
+
 def set_correlation_id(cid: Optional[str]):
     """Sets the correlation ID for the current context."""
     _correlation_id_ctx.set(cid)
@@ -27,34 +38,62 @@ class JSONFormatter(logging.Formatter):
     def format(self, record: logging.LogRecord) -> str:
         # 1. Base Data
         log_data: Dict[str, Any] = {
-            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            # record.created is captured at log-call time; reuse it instead of a second clock read
+            "timestamp": datetime.datetime.fromtimestamp(record.created, datetime.timezone.utc).isoformat(),
             "level": record.levelname,
             "component": record.name,
             "message": record.getMessage(),
         }
         
-        # 2. Correlation ID
-        cid = get_correlation_id()
+        # 2. Correlation ID (captured on the caller side when queued)
+        cid = getattr(record, "correlation_id", None) or get_correlation_id()
         if cid:
             log_data["correlation_id"] = cid
             
         # 3. Exception Info
-        if record.exc_info:
+        if record.exc_info and not record.exc_text:
             # Format exception
-            if not record.exc_text:
-                record.exc_text = self.formatException(record.exc_info)
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
             log_data["stack_trace"] = record.exc_text
             
         # 4. Extra Fields (if passed via extra={...})
         if hasattr(record, "custom_metrics"):
              log_data["metrics"] = record.custom_metrics # type: ignore
 
-        return json.dumps(log_data)
+        if orjson is not None:
+            return orjson.dumps(log_data, default=str).decode("utf-8")
+        return json.dumps(log_data, default=str)
+
+class _ContextQueueHandler(QueueHandler):
+    """
+    QueueHandler that captures the correlation ID on the caller's context
+    before the record crosses to the listener thread. Unlike the stock
+    prepare(), the message is not pre-formatted so the listener's
+    JSONFormatter still sees the traceback separately.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.correlation_id = get_correlation_id()
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            # Tracebacks cannot cross threads safely; render them now
+            if not record.exc_text:
+                record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
 
 def setup_logging(log_file: str, level: int = logging.INFO):
     """
     Configures the root logger with rotating JSON handler.
+    Formatting and disk I/O run on a background QueueListener thread so
+    log calls on the event loop only pay for a queue put.
     """
+    global _listener
+    stop_logging()
+
     root_logger = logging.getLogger()
     root_logger.setLevel(level)
     
@@ -76,7 +115,11 @@ def setup_logging(log_file: str, level: int = logging.INFO):
     )
     
     handler.setFormatter(JSONFormatter())
-    root_logger.addHandler(handler)
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    root_logger.addHandler(_ContextQueueHandler(log_queue))
+    _listener = QueueListener(log_queue, handler)
+    _listener.start()
     
     # Optional: Also log to console (stderr) for dev visibility?
     # For now, let's keep it strictly to file as "Black Box", 
@@ -86,3 +129,14 @@ def setup_logging(log_file: str, level: int = logging.INFO):
     
     # Log startup
     logging.getLogger("System").info("Logging system initialized.")
+
+def stop_logging():
+    """
+    Stops the background listener, flushing any queued records to disk.
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for h in _listener.handlers:
+            h.close()
+        _listener = None
@@ -1,40 +1,63 @@
 import logging
 import os
 import sys
-import threading
-import html
 import asyncio
 import signal
 import socket
+import threading
 import time
-from http.server import HTTPServer, BaseHTTPRequestHandler
+import urllib.parse
+from collections import defaultdict
+from functools import lru_cache
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Optional, Dict
-import copy
+import dataclasses
 
-# --- NETWORK CONFIGURATION: DNS PATCH ---
-# This patch forces the application to resolve api.telegram.org to its known IP address.
-# This bypasses the OS-level DNS resolver which often fails in restricted Docker environments.
+# --- NETWORK CONFIGURATION: DNS CACHE ---
+# api.telegram.org is pinned to its known IP inside the bot's own HTTP client
+# (see telegram_request.py); every other lookup goes through the system
+# resolver behind a small TTL cache installed here.
 
 print("Initializing Network Configuration...")
 _original_getaddrinfo = socket.getaddrinfo
 
+# Successful lookups are reused for DNS_CACHE_TTL seconds so patrols that hit
+# the same hosts every minute skip the resolver round-trip entirely.
+DNS_CACHE_TTL = 300
+DNS_CACHE_MAX_ENTRIES = 1024
+_dns_cache = {}
+# asyncio/anyio resolve from executor threads, so several lookups can run at once
+_dns_cache_lock = threading.Lock()
+
 def _patched_getaddrinfo(host, port, family=0, type=0, proto=0, flags=0):
     """
-    Overrides DNS resolution for specific hosts to bypass OS-level resolver failures.
+    Resolves through the system resolver behind a small TTL cache.
     """
-    if host == "api.telegram.org":
-        # Direct routing to Telegram API (Amsterdam/London Datacenter)
-        # 149.154.167.220 is the stable IP for api.telegram.org
-        return [(socket.AF_INET, socket.SOCK_STREAM, 6, "", ("149.154.167.220", port or 443))]
+    key = (host, port, family, type, proto, flags)
+    now = time.monotonic()
+    with _dns_cache_lock:
+        cached = _dns_cache.get(key)
+    if cached and cached[0] > now:
+        return cached[1]
     
-    # Fallback to system resolver for all other domains
-    return _original_getaddrinfo(host, port, family, type, proto, flags)
+    # Failures raise before anything is cached; the resolver runs unlocked
+    result = _original_getaddrinfo(host, port, family, type, proto, flags)
+    with _dns_cache_lock:
+        _dns_cache.pop(key, None)
+        # Entries sit in insertion order, i.e. soonest expiry first: drop expired
+        # ones, then the oldest if the cache is still full.
+        while _dns_cache:
+            oldest = next(iter(_dns_cache))
+            if _dns_cache[oldest][0] > now and len(_dns_cache) < DNS_CACHE_MAX_ENTRIES:
+                break
+            del _dns_cache[oldest]
+        _dns_cache[key] = (now + DNS_CACHE_TTL, result)
+    return result
 
 # Apply the patch immediately
 socket.getaddrinfo = _patched_getaddrinfo
-print("DNS Patch Applied: api.telegram.org -> 149.154.167.220")
+print("DNS cache installed.")
 
 
 # --- 1. LOGGING CONFIGURATION ---
@@ -49,9 +72,10 @@ logger = logging.getLogger("WebDogBot")
 
 
 # --- 2. IMPORTS & ENVIRONMENT ---
-# Third-party imports are loaded after the DNS patch to ensure they use the patched socket.
+# Third-party imports are loaded after the DNS patch to ensure they use the cached resolver.
 from dotenv import load_dotenv
 from telegram import Update
+from telegram.error import TelegramError
 from telegram.ext import (
     Application,
     CommandHandler,
@@ -68,6 +92,9 @@ if not TOKEN:
     logger.critical("FATAL: No TELEGRAM_TOKEN found in environment variables.")
     sys.exit(1)
 
+# Max Telegram updates processed at once
+MAX_CONCURRENT_UPDATES = 256
+
 # Ensure internal module path is correct
 sys.path.append(str(Path(__file__).resolve().parent))
 
@@ -77,67 +104,92 @@ try:
     from request_manager import GlobalRequestManager
     from fingerprinter import VersionedContentFingerprinter
     from similarity import SimilarityEngine
-    from models import Monitor, UserData
+    from models import Monitor, UserData, utcnow_iso
     from metrics import get_metrics_tracker
     from governor import get_governor
     from history_manager import HistoryManager
     import interface
+    from telegram_request import PinnedHTTPXRequest, TELEGRAM_API_IP
 except ImportError as e:
     logger.critical(f"Startup Import Error: {e}")
     sys.exit(1)
 
 
-# --- 3. HEALTH CHECK SERVER ---
-class HealthCheckHandler(BaseHTTPRequestHandler):
+def normalize_watch_url(url: str) -> str:
     """
-    Simple HTTP handler to respond to uptime checks (e.g., UptimeRobot).
+    Canonical form for user-typed URLs so `google.com` and
+    `HTTPS://Google.com/` resolve to the same monitor key.
     """
-    def do_GET(self):
-        self.send_response(200)
-        self.send_header("Content-type", "text/plain")
-        self.end_headers()
-        self.wfile.write(b"WebDog is running")
-    
-    def log_message(self, format, *args):
-        pass # Silence access logs to keep console clean
+    url = url.strip()
+    if not url.lower().startswith(("http://", "https://")):
+        url = "https://" + url
+    parts = urllib.parse.urlsplit(url)
+    path = "" if parts.path == "/" else parts.path
+    return urllib.parse.urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, parts.query, parts.fragment))
+
+
+@lru_cache(maxsize=8192)
+def iso_timestamp(value: str) -> float:
+    """
+    Epoch seconds for a stored ISO-8601 timestamp. Memoized: patrol re-reads
+    the same last_check/snooze strings every tick for monitors not yet due.
+    """
+    return datetime.fromisoformat(value).timestamp()
+
+
+# --- 3. HEALTH CHECK SERVER ---
+# Served from the bot's own event loop (no extra thread) for uptime checks (e.g., UptimeRobot).
+HEALTH_BODY = b"WebDog is running"
+HEALTH_RESPONSE = (
+    b"HTTP/1.1 200 OK\r\n"
+    b"Content-Type: text/plain\r\n"
+    b"Content-Length: " + str(len(HEALTH_BODY)).encode() + b"\r\n"
+    b"Connection: close\r\n\r\n" + HEALTH_BODY
+)
+
+async def handle_health_check(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    """Answers any request with a fixed 200 response."""
+    try:
+        # Consume the request head; a client that never finishes it is dropped
+        await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), timeout=5)
+        writer.write(HEALTH_RESPONSE)
+        await writer.drain()
+    except (asyncio.TimeoutError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+        pass
+    finally:
+        writer.close()
 
-def start_health_check_server():
-    """Starts a simple HTTP server in a daemon thread."""
+async def start_health_check_server() -> Optional[asyncio.AbstractServer]:
+    """Starts the health check listener on the running loop."""
     try:
         # Port 7860 is the standard for Hugging Face Spaces
         port = int(os.environ.get("PORT", 7860))
-        server = HTTPServer(("0.0.0.0", port), HealthCheckHandler)
+        server = await asyncio.start_server(handle_health_check, "0.0.0.0", port)
         logger.info(f"Health Check Server listening on port {port}")
-        server.serve_forever()
+        return server
     except Exception as e:
         logger.error(f"Failed to start Health Check Server: {e}")
+        return None
 
 
 # --- 4. NETWORK DIAGNOSTIC ---
 async def wait_for_internet():
     """
-    Performs a deep network diagnostic before starting the bot.
-    1. Tests direct IP connectivity (Ping Google DNS).
-    2. Tests DNS resolution/Connectivity to Telegram.
+    Performs a network diagnostic before starting the bot: opens a TCP
+    connection to Telegram's pinned IP until one succeeds.
     """
     logger.info("Performing network connectivity check...")
     
     while True:
         try:
-            # Check 1: IP Connectivity
-            socket.create_connection(("8.8.8.8", 53), timeout=2)
-            
-            # Check 2: Telegram Connectivity (using patched DNS)
-            try:
-                # We attempt to open a socket to the API to prove the route is open
-                socket.create_connection(('api.telegram.org', 443), timeout=3)
-                logger.info("Network and DNS verified. Proceeding to startup.")
-                return
-            except Exception as e:
-                logger.warning(f"Connection to Telegram failed: {e}. Retrying...")
-
-        except (OSError, socket.timeout):
-            logger.warning("No network route available. Waiting for container network...")
+            # Non-blocking probe; the health listener stays responsive meanwhile
+            _, writer = await asyncio.wait_for(asyncio.open_connection(TELEGRAM_API_IP, 443), timeout=3)
+            writer.close()
+            await writer.wait_closed()
+            logger.info("Network route to Telegram verified. Proceeding to startup.")
+            return
+        except (OSError, asyncio.TimeoutError) as e:
+            logger.warning(f"Connection to Telegram failed: {e}. Waiting for container network...")
             
         await asyncio.sleep(3)
 
@@ -147,12 +199,26 @@ class WebDogBot:
     """
     Main controller class for the WebDog application.
     """
+    # Ceiling for the adaptive check interval of pages that never change
+    MAX_ADAPTIVE_INTERVAL = 3600
+    
     def __init__(self):
         self.db_manager = AtomicDatabaseManager()
         self.request_manager = GlobalRequestManager()
         self.fingerprinter = VersionedContentFingerprinter()
         self.similarity_engine = SimilarityEngine()
         self.application: Optional[Application] = None
+        # callback_data prefix (text before the first "_") -> handler(update, context, rest)
+        self._callback_handlers = {
+            "CMD": self._on_command_callback,
+            "SET": self._on_settings_callback,
+            "DETAILS": self._on_details_callback,
+            "HISTORY": self._on_history_callback,
+            "EXPORT": self._on_export_callback,
+            "OPEN": self._on_open_settings_callback,
+            "DELETE": self._on_delete_callback,
+            "SNOOZE": self._on_snooze_callback,
+        }
         
     async def startup(self):
         """Initializes all subsystems."""
@@ -172,6 +238,8 @@ class WebDogBot:
     async def shutdown(self):
         """Gracefully shuts down subsystems."""
         logger.info("Shutting down WebDog...")
+        # Persist any debounced mutations before the loop goes away
+        await self.db_manager.flush()
         if self.request_manager:
             await self.request_manager.close()
         await get_governor().telegram_throttler.stop()
@@ -191,9 +259,7 @@ class WebDogBot:
             await update.message.reply_text("Usage: /watch <url>")
             return
         
-        url = context.args[0]
-        if not url.startswith(("http", "https")): 
-            url = "https://" + url
+        url = normalize_watch_url(context.args[0])
         
         msg = await update.message.reply_text("Analyzing target...")
         
@@ -205,16 +271,19 @@ class WebDogBot:
             
             fp = self.fingerprinter.generate_fingerprint(result.content)
             monitor = Monitor(url=url, fingerprint=fp)
+            if result.status_code == 200:
+                # Seed validators so the very first patrol can be conditional
+                monitor.metadata.etag = result.etag
+                monitor.metadata.last_modified = result.last_modified
             
             all_data = await self.db_manager.load_all_monitors()
             user_data = all_data.get(chat_id, UserData())
             
             # Update existing monitor or add new one
-            user_data.monitors = [m for m in user_data.monitors if m.url != url]
-            user_data.monitors.append(monitor)
+            user_data.upsert_monitor(monitor)
             all_data[chat_id] = user_data
             
-            await self.db_manager.atomic_write(all_data)
+            self.db_manager.mark_dirty(chat_id)
             await context.bot.edit_message_text(chat_id=chat_id, message_id=msg.message_id, text=f"Watching {url}")
             
         except Exception as e:
@@ -224,8 +293,10 @@ class WebDogBot:
     async def cmd_unwatch(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         chat_id = str(update.effective_chat.id)
         if not context.args: return
-        url = context.args[0]
-        await self.delete_monitor_logic(chat_id, url)
+        url = normalize_watch_url(context.args[0])
+        if not await self.delete_monitor_logic(chat_id, url):
+            # Monitors stored before normalization keep their raw URL
+            await self.delete_monitor_logic(chat_id, context.args[0])
         await update.message.reply_text(f"Removed {url}")
 
     async def cmd_list(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -234,128 +305,264 @@ class WebDogBot:
     async def handle_callback(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         query = update.callback_query
         await query.answer()
-        data = query.data
-        
-        if data == "CMD_MENU":
+        prefix, _, rest = query.data.partition("_")
+        handler = self._callback_handlers.get(prefix)
+        if handler:
+            await handler(update, context, rest)
+
+    async def _on_command_callback(self, update, context, rest):
+        query = update.callback_query
+        if rest == "MENU":
             await query.edit_message_text("<b>Menu</b>", reply_markup=interface.get_main_menu_keyboard(), parse_mode="HTML")
-        elif data.startswith("CMD_LIST_"):
-            await self.show_monitor_list(update, context, int(data.split("_")[-1]), edit=True)
-        elif data == "CMD_HEALTH":
+        elif rest.startswith("LIST_"):
+            await self.show_monitor_list(update, context, int(rest.split("_")[-1]), edit=True)
+        elif rest == "HEALTH":
             await self.show_health(update)
-        elif data == "CMD_SETTINGS":
+        elif rest == "SETTINGS":
              chat_id = str(update.effective_chat.id)
              all_data = await self.db_manager.load_all_monitors()
              ud = all_data.get(chat_id, UserData())
              await query.edit_message_text("<b>Global Settings</b>", reply_markup=interface.get_settings_keyboard(ud.user_config, "GLOBAL"), parse_mode="HTML")
-        elif data.startswith("SET_"):
-            await self.handle_settings_action(update, data, str(update.effective_chat.id))
-        elif data.startswith("DETAILS_"):
-            await self.show_monitor_details(update, data.replace("DETAILS_", ""))
-        elif data.startswith("HISTORY_"):
-            await self.show_history(update, data.replace("HISTORY_", ""))
-        elif data.startswith("EXPORT_"):
-            parts = data.split("_", 2)
-            await self.export_data(update, context, parts[2], parts[1])
-        elif data.startswith("OPEN_SETTINGS_"):
-             await self.open_monitor_settings(update, str(update.effective_chat.id), data.replace("OPEN_SETTINGS_", ""))
-        elif data.startswith("DELETE_"):
-             await self.delete_monitor_logic(str(update.effective_chat.id), data.replace("DELETE_", ""))
-             await self.show_monitor_list(update, context, 0, edit=True)
-        elif data.startswith("SNOOZE_"):
-            parts = data.split("_", 2)
-            await self.snooze_monitor(str(update.effective_chat.id), parts[2], int(parts[1]))
-            await context.bot.send_message(str(update.effective_chat.id), f"Snoozing {parts[2]} for {parts[1]}m")
+
+    async def _on_settings_callback(self, update, context, rest):
+        await self.handle_settings_action(update, "SET_" + rest, str(update.effective_chat.id))
+
+    async def _on_details_callback(self, update, context, rest):
+        await self.show_monitor_details(update, rest)
+
+    async def _on_history_callback(self, update, context, rest):
+        await self.show_history(update, rest)
+
+    async def _on_export_callback(self, update, context, rest):
+        fmt, _, url = rest.partition("_")
+        await self.export_data(update, context, url, fmt)
+
+    async def _on_open_settings_callback(self, update, context, rest):
+        if rest.startswith("SETTINGS_"):
+             await self.open_monitor_settings(update, str(update.effective_chat.id), rest[len("SETTINGS_"):])
+
+    async def _on_delete_callback(self, update, context, rest):
+        await self.delete_monitor_logic(str(update.effective_chat.id), rest)
+        await self.show_monitor_list(update, context, 0, edit=True)
+
+    async def _on_snooze_callback(self, update, context, rest):
+        mins, _, url = rest.partition("_")
+        await self.snooze_monitor(str(update.effective_chat.id), url, int(mins))
+        await context.bot.send_message(str(update.effective_chat.id), f"Snoozing {url} for {mins}m")
 
     # --- Job Queue Tasks ---
 
     async def patrol_job(self, context: ContextTypes.DEFAULT_TYPE):
         """
         Periodic task to check watched URLs for changes.
+        Hosts are checked concurrently (bounded by the governor's patrol_limiter),
+        each host's URLs sequentially; the DB write happens once at the end of the tick.
         """
         if get_governor().is_congested:
              return 
 
         try:
             all_data = await self.db_manager.load_all_monitors()
-            updates_needed = False
-            
+            limiter = get_governor().patrol_limiter
+            # (url, etag, last_modified) -> fetch task, shared by every
+            # subscriber of the same page within this tick
+            tick_fetches: Dict[tuple, asyncio.Future] = {}
+            # Hosts that answered 429 this tick; their remaining URLs wait
+            rate_limited_hosts: set = set()
+
+            # Group by host: one host's URLs are checked one after another
+            # (polite, keeps a single pooled connection busy) while
+            # different hosts are patrolled in parallel.
+            # Only monitors that are due get a slot; the rest cost one float compare
+            now_ts = time.time()
+            by_host: Dict[str, list] = defaultdict(list)
             for chat_id, user_data in all_data.items():
-                for monitor in user_data.monitors:
+                for monitor in list(user_data.monitors):
+                    if not self._is_due(monitor, monitor.config or user_data.user_config, now_ts):
+                        continue
+                    by_host[urllib.parse.urlsplit(monitor.url).netloc].append((chat_id, user_data, monitor))
+
+            async def host_worker(host, checks):
+                outcomes = []
+                for chat_id, user_data, monitor in checks:
+                    if host in rate_limited_hosts:
+                        break
                     try:
-                        config = monitor.config or user_data.user_config
-                        
-                        # Check Snooze
-                        if monitor.metadata.snooze_until:
-                            snooze = datetime.fromisoformat(monitor.metadata.snooze_until)
-                            if datetime.now(timezone.utc) < snooze: continue
-                            else: 
-                                monitor.metadata.snooze_until = None
-                                updates_needed = True
-                        
-                        # Check Interval
-                        if monitor.metadata.last_check:
-                             last_ts = datetime.fromisoformat(monitor.metadata.last_check)
-                             elapsed = (datetime.now(timezone.utc) - last_ts).total_seconds()
-                             if elapsed < config.check_interval: continue
-                        
-                        # Acquire Token
-                        await get_governor().acquire_web_token()
-                        
-                        # Fetch
-                        result = await self.request_manager.fetch(monitor.url)
-                        monitor.metadata.check_count += 1
-                        
-                        # Handle Rate Limits (429)
-                        if result.status_code == 429:
-                            monitor.metadata.rate_limit_count += 1
-                            if monitor.metadata.rate_limit_count >= 3:
-                                try:
-                                    await get_governor().telegram_throttler.send_message(
-                                        context.bot.send_message(chat_id=chat_id, text=f"Rate Limit: {html.escape(monitor.url)}", parse_mode="HTML")
-                                    )
-                                    monitor.metadata.rate_limit_count = 0 
-                                except Exception: pass
-                            updates_needed = True
-                            continue 
-                        
-                        monitor.metadata.rate_limit_count = 0
-                        
-                        # Handle Fetch Errors
-                        if result.error or not result.content:
-                            monitor.metadata.failure_count += 1
-                            continue
-                        
-                        # Comparison Logic
-                        new_fp = self.fingerprinter.generate_fingerprint(result.content)
-                        monitor.metadata.last_check = datetime.now(timezone.utc).isoformat()
-                        
-                        if monitor.fingerprint and monitor.fingerprint.hash != new_fp.hash:
-                             score = self.similarity_engine.calculate_similarity(monitor.fingerprint, new_fp).final_score
-                             if score < config.similarity_threshold:
-                                 msg = interface.format_diff_message(monitor.url, score, "Change Detected", "")
-                                 kb = interface.get_alert_keyboard(monitor.url)
-                                 await get_governor().telegram_throttler.send_message(
-                                     context.bot.send_message(chat_id=chat_id, text=msg, reply_markup=kb, parse_mode="HTML")
-                                 )
-                                 HistoryManager.add_history_entry(monitor, "CHANGE", score, "Alerted")
-                             else:
-                                 HistoryManager.add_history_entry(monitor, "MINOR", score, "Silent Update")
-                             monitor.fingerprint = new_fp
-                             updates_needed = True
-                        elif not monitor.fingerprint:
-                            monitor.fingerprint = new_fp
-                            updates_needed = True
-                            
+                        async with limiter:
+                            # The work list is a snapshot; skip monitors that a
+                            # command removed or replaced while we were queued
+                            if user_data.get_monitor(monitor.url) is not monitor:
+                                continue
+                            res = await self._patrol_monitor(context, chat_id, user_data, monitor, tick_fetches, rate_limited_hosts)
                     except Exception as e:
-                        logger.error(f"Error checking {monitor.url}: {e}")
-                        monitor.metadata.failure_count += 1
-                        updates_needed = True
+                        # One misbehaving check must not discard the rest of the tick
+                        logger.error(f"Patrol task failed for {monitor.url}: {e}")
+                        res = True
+                    outcomes.append((chat_id, res))
+                return outcomes
+
+            results = await asyncio.gather(*[
+                host_worker(host, checks) for host, checks in by_host.items()
+            ])
+            
+            changed_chats = {chat_id for outcomes in results for chat_id, res in outcomes if res}
 
-            if updates_needed:
-                 await self.db_manager.atomic_write(all_data)
+            if changed_chats:
+                 await self.db_manager.atomic_write(all_data, changed=changed_chats)
         except Exception as e:
             logger.critical(f"Fatal Patrol Error: {e}", exc_info=True)
 
+    async def _acquire_and_fetch(self, url: str, validators: dict):
+        """Takes a web token and fetches the URL (one network round per tick)."""
+        await get_governor().acquire_web_token()
+        return await self.request_manager.fetch(url, **validators)
+
+    async def _patrol_monitor(self, context, chat_id: str, user_data: UserData, monitor: Monitor, tick_fetches: Optional[Dict[tuple, asyncio.Future]] = None, rate_limited_hosts: Optional[set] = None) -> bool:
+        """
+        Checks a single monitor. Returns True if the monitor was modified
+        and the DB needs to be written.
+        tick_fetches de-duplicates fetches of the same URL across users;
+        rate_limited_hosts collects hosts that answered 429.
+        """
+        updates_needed = False
+        try:
+            config = monitor.config or user_data.user_config
+            
+            now_ts = time.time()
+            
+            # Check Snooze
+            if monitor.metadata.snooze_until:
+                if now_ts < iso_timestamp(monitor.metadata.snooze_until): return False
+                else: 
+                    monitor.metadata.snooze_until = None
+                    updates_needed = True
+            
+            # Check Interval
+            if not self._is_due(monitor, config, now_ts): return updates_needed
+            
+            # Fetch (conditional when the last response carried validators)
+            validators = {}
+            if monitor.metadata.etag:
+                validators["etag"] = monitor.metadata.etag
+            if monitor.metadata.last_modified:
+                validators["last_modified"] = monitor.metadata.last_modified
+            
+            if tick_fetches is None:
+                result = await self._acquire_and_fetch(monitor.url, validators)
+            else:
+                fetch_key = (monitor.url, monitor.metadata.etag, monitor.metadata.last_modified)
+                fetch_task = tick_fetches.get(fetch_key)
+                if fetch_task is None:
+                    fetch_task = asyncio.ensure_future(self._acquire_and_fetch(monitor.url, validators))
+                    tick_fetches[fetch_key] = fetch_task
+                # Shield so one cancelled subscriber doesn't cancel the shared fetch
+                result = await asyncio.shield(fetch_task)
+            monitor.metadata.check_count += 1
+            
+            # Handle Rate Limits (429)
+            if result.status_code == 429:
+                if rate_limited_hosts is not None:
+                    rate_limited_hosts.add(urllib.parse.urlsplit(monitor.url).netloc)
+                monitor.metadata.rate_limit_count += 1
+                if monitor.metadata.rate_limit_count >= 3:
+                    try:
+                        await get_governor().telegram_throttler.send_message(
+                            context.bot.send_message(chat_id=chat_id, text=f"Rate Limit: {interface.escape_url(monitor.url)}", parse_mode="HTML")
+                        )
+                        monitor.metadata.rate_limit_count = 0 
+                    except Exception: pass
+                return True
+            
+            monitor.metadata.rate_limit_count = 0
+            
+            # 304 Not Modified: page unchanged, skip parse/hash entirely
+            if result.status_code == 304:
+                monitor.metadata.last_check = utcnow_iso()
+                self._back_off(monitor, config)
+                return True
+            
+            # Handle Fetch Errors
+            if result.error or not result.content:
+                monitor.metadata.failure_count += 1
+                return updates_needed
+            
+            monitor.metadata.last_check = utcnow_iso()
+            if result.status_code == 200:
+                monitor.metadata.etag = result.etag
+                monitor.metadata.last_modified = result.last_modified
+            
+            # Byte-identical body: nothing to parse or compare
+            digest = self.fingerprinter.raw_digest(result.content)
+            if (monitor.fingerprint and digest == monitor.metadata.content_digest
+                    and monitor.fingerprint.algorithm == self.fingerprinter.ALGORITHM):
+                self._back_off(monitor, config)
+                return True
+            
+            # Comparison Logic
+            new_fp = self.fingerprinter.generate_fingerprint(result.content, digest)
+            monitor.metadata.content_digest = digest
+            
+            if monitor.fingerprint and monitor.fingerprint.algorithm != new_fp.algorithm:
+                # Baseline was hashed with an older scheme (e.g. MD5); re-baseline silently
+                monitor.fingerprint = new_fp
+                updates_needed = True
+            elif monitor.fingerprint and monitor.fingerprint.hash != new_fp.hash:
+                 score = self.similarity_engine.calculate_similarity(monitor.fingerprint, new_fp).final_score
+                 if score < config.similarity_threshold:
+                     # Real change: return to the configured cadence
+                     monitor.metadata.adaptive_interval = None
+                     msg = interface.format_diff_message(monitor.url, score, "Change Detected", "")
+                     kb = interface.get_alert_keyboard(monitor.url)
+                     # Sent right away with its action keyboard; the throttler paces bursts
+                     await get_governor().telegram_throttler.send_message(
+                         context.bot.send_message(chat_id=chat_id, text=msg, reply_markup=kb, parse_mode="HTML")
+                     )
+                     HistoryManager.add_history_entry(monitor, "CHANGE", score, "Alerted")
+                 else:
+                     monitor.metadata.adaptive_interval = None
+                     HistoryManager.add_history_entry(monitor, "MINOR", score, "Silent Update")
+                 monitor.fingerprint = new_fp
+                 updates_needed = True
+            elif not monitor.fingerprint:
+                monitor.fingerprint = new_fp
+                updates_needed = True
+            elif self._back_off(monitor, config):
+                # Unchanged; persist only when the interval actually moved
+                updates_needed = True
+                
+        except Exception as e:
+            logger.error(f"Error checking {monitor.url}: {e}")
+            monitor.metadata.failure_count += 1
+            updates_needed = True
+
+        return updates_needed
+
+    def _is_due(self, monitor: Monitor, config, now_ts: float) -> bool:
+        """
+        True if the monitor is neither snoozed nor inside its check interval
+        (stretched by adaptive_interval while the page keeps coming back unchanged).
+        """
+        meta = monitor.metadata
+        if meta.snooze_until and now_ts < iso_timestamp(meta.snooze_until):
+            return False
+        if meta.last_check:
+            interval = max(config.check_interval, meta.adaptive_interval or 0)
+            if now_ts - iso_timestamp(meta.last_check) < interval:
+                return False
+        return True
+
+    def _back_off(self, monitor: Monitor, config) -> bool:
+        """
+        Doubles the check interval of an unchanged page, up to MAX_ADAPTIVE_INTERVAL.
+        Returns True if the interval changed.
+        """
+        current = max(config.check_interval, monitor.metadata.adaptive_interval or 0)
+        backed_off = max(config.check_interval, min(current * 2, self.MAX_ADAPTIVE_INTERVAL))
+        if backed_off == monitor.metadata.adaptive_interval:
+            return False
+        monitor.metadata.adaptive_interval = backed_off
+        return True
+
     async def cleanup_job(self, context: ContextTypes.DEFAULT_TYPE):
         await asyncio.to_thread(HistoryManager.cleanup_exports, 60)
 
@@ -376,21 +583,21 @@ class WebDogBot:
          kb = [[interface.InlineKeyboardButton("Back", callback_data="CMD_MENU")]]
          await update.callback_query.edit_message_text(msg, reply_markup=interface.InlineKeyboardMarkup(kb), parse_mode="HTML")
 
-    async def delete_monitor_logic(self, chat_id, url):
+    async def delete_monitor_logic(self, chat_id, url) -> bool:
         all_data = await self.db_manager.load_all_monitors()
         ud = all_data.get(chat_id)
-        if ud:
-            ud.monitors = [m for m in ud.monitors if m.url != url]
-            all_data[chat_id] = ud
-            await self.db_manager.atomic_write(all_data)
+        if ud and ud.remove_monitor(url) is not None:
+            self.db_manager.mark_dirty(chat_id)
+            return True
+        return False
 
     async def open_monitor_settings(self, update, chat_id, url):
          all_data = await self.db_manager.load_all_monitors()
          ud = all_data.get(chat_id)
-         m = next((m for m in ud.monitors if m.url == url), None)
+         m = ud.get_monitor(url)
          if m:
-             if not m.config: m.config = copy.deepcopy(ud.user_config)
-             await update.callback_query.edit_message_text(f"<b>{url}</b>", reply_markup=interface.get_settings_keyboard(m.config, url), parse_mode="HTML")
+             if not m.config: m.config = dataclasses.replace(ud.user_config)
+             await update.callback_query.edit_message_text(f"<b>{interface.escape_url(url)}</b>", reply_markup=interface.get_settings_keyboard(m.config, url), parse_mode="HTML")
 
     async def handle_settings_action(self, update, data, chat_id):
         parts = data.split("_", 3)
@@ -401,10 +608,10 @@ class WebDogBot:
         ud = all_data.get(chat_id)
         if not ud: return
         
-        target_conf = ud.user_config if context_id == "GLOBAL" else next((m.config for m in ud.monitors if m.url == context_id), None)
+        m = None if context_id == "GLOBAL" else ud.get_monitor(context_id)
+        target_conf = ud.user_config if context_id == "GLOBAL" else (m.config if m else None)
         if not target_conf and context_id != "GLOBAL":
-             m = next((m for m in ud.monitors if m.url == context_id), None)
-             if m and not m.config: m.config = copy.deepcopy(ud.user_config)
+             if m and not m.config: m.config = dataclasses.replace(ud.user_config)
              target_conf = m.config
              
         if target_conf:
@@ -417,16 +624,16 @@ class WebDogBot:
              elif action == "TOGGLE_DIFF":
                  target_conf.include_diff = not target_conf.include_diff
              
-             await self.db_manager.atomic_write(all_data)
+             self.db_manager.mark_dirty(chat_id)
              await update.callback_query.edit_message_text(f"<b>Settings</b>", reply_markup=interface.get_settings_keyboard(target_conf, context_id), parse_mode="HTML")
 
     async def show_monitor_details(self, update, url):
         chat_id = str(update.effective_chat.id)
         all_data = await self.db_manager.load_all_monitors()
         ud = all_data.get(chat_id)
-        m = next((x for x in ud.monitors if x.url == url), None)
+        m = ud.get_monitor(url)
         if not m: return
-        text = f"<b>{url}</b>\nStatus: {'Online' if m.metadata.failure_count == 0 else 'Failing'}"
+        text = f"<b>{interface.escape_url(url)}</b>\nStatus: {'Online' if m.metadata.failure_count == 0 else 'Failing'}"
         kb = [
             [interface.InlineKeyboardButton("Settings", callback_data=f"OPEN_SETTINGS_{url}")],
             [interface.InlineKeyboardButton("History", callback_data=f"HISTORY_{url}"), interface.InlineKeyboardButton("Delete", callback_data=f"DELETE_{url}")],
@@ -438,27 +645,34 @@ class WebDogBot:
         chat_id = str(update.effective_chat.id)
         all_data = await self.db_manager.load_all_monitors()
         ud = all_data.get(chat_id)
-        m = next((x for x in ud.monitors if x.url == url), None)
+        m = ud.get_monitor(url)
         if m:
             txt = interface.format_history_log(m.history_log)
-            await update.callback_query.edit_message_text(f"{url}\n{txt}", reply_markup=interface.get_history_keyboard(url), parse_mode="HTML")
+            await update.callback_query.edit_message_text(f"{interface.escape_url(url)}\n{txt}", reply_markup=interface.get_history_keyboard(url), parse_mode="HTML")
 
     async def export_data(self, update, context, url, fmt):
         chat_id = str(update.effective_chat.id)
         all_data = await self.db_manager.load_all_monitors()
         ud = all_data.get(chat_id)
-        m = next((x for x in ud.monitors if x.url == url), None)
+        m = ud.get_monitor(url)
         if m:
-            path = HistoryManager.export_to_csv(m) if fmt == "CSV" else HistoryManager.export_to_json(m)
-            if path: await context.bot.send_document(chat_id, open(path, 'rb'), filename=os.path.basename(path))
+            # Export and file reads hit the disk, so they run in a worker thread
+            # (as cleanup_job does). The thread gets its own copy of the history
+            # list because patrol may append to it meanwhile.
+            snapshot = Monitor(url=m.url, metadata=m.metadata, history_log=list(m.history_log))
+            exporter = HistoryManager.export_to_csv if fmt == "CSV" else HistoryManager.export_to_json
+            path = await asyncio.to_thread(exporter, snapshot)
+            if path:
+                document = await asyncio.to_thread(Path(path).read_bytes)
+                await context.bot.send_document(chat_id, document, filename=os.path.basename(path))
 
     async def snooze_monitor(self, chat_id, url, mins):
         all_data = await self.db_manager.load_all_monitors()
         ud = all_data.get(chat_id)
-        m = next((x for x in ud.monitors if x.url == url), None)
+        m = ud.get_monitor(url)
         if m:
             m.metadata.snooze_until = (datetime.now(timezone.utc) + timedelta(minutes=mins)).isoformat()
-            await self.db_manager.atomic_write(all_data)
+            self.db_manager.mark_dirty(chat_id)
 
 
 # --- 6. MAIN EXECUTION ---
@@ -468,8 +682,8 @@ async def main():
     """
     logger.info("System entry point reached.")
 
-    # 1. Start Health Check (Daemon)
-    threading.Thread(target=start_health_check_server, daemon=True).start()
+    # 1. Start Health Check (same loop, serves while we wait for the network)
+    health_server = await start_health_check_server()
     
     # 2. WAIT FOR INTERNET (Verify Patch)
     await wait_for_internet()
@@ -480,7 +694,17 @@ async def main():
     
     # 4. Build Application
     logger.info("Building Telegram Application...")
-    application = Application.builder().token(TOKEN).build()
+    # Handle updates concurrently (bounded) so one slow callback doesn't
+    # hold up every other user's button presses
+    # Both Telegram clients dial api.telegram.org's pinned IP (PTB's default pool sizes)
+    application = (
+        Application.builder()
+        .token(TOKEN)
+        .request(PinnedHTTPXRequest(connection_pool_size=MAX_CONCURRENT_UPDATES))
+        .get_updates_request(PinnedHTTPXRequest(connection_pool_size=1))
+        .concurrent_updates(MAX_CONCURRENT_UPDATES)
+        .build()
+    )
     
     if not application.job_queue:
         logger.critical("JobQueue failed to initialize. Ensure python-telegram-bot[job_queue] is installed.")
@@ -502,13 +726,43 @@ async def main():
     await application.initialize()
     await application.start()
     
-    logger.info("Starting Polling...")
-    await application.updater.start_polling(allowed_updates=Update.ALL_TYPES)
+    # Webhook mode (Telegram pushes updates) when a public URL is configured;
+    # needs python-telegram-bot[webhooks]. Otherwise long polling.
+    webhook_url = os.getenv("WEBHOOK_URL")
+    if webhook_url:
+        try:
+            await application.updater.start_webhook(
+                listen="0.0.0.0",
+                port=int(os.getenv("WEBHOOK_PORT", 8443)),
+                url_path="telegram",
+                webhook_url=f"{webhook_url.rstrip('/')}/telegram",
+                secret_token=os.getenv("WEBHOOK_SECRET"),
+                allowed_updates=Update.ALL_TYPES
+            )
+            logger.info("Receiving updates via webhook.")
+        except (RuntimeError, TelegramError, OSError) as e:
+            # Missing webhooks extra, setWebhook rejected (bad URL) or port in use
+            logger.error(f"Webhook unavailable ({e}); falling back to polling.")
+            webhook_url = None
+    
+    if not webhook_url:
+        logger.info("Starting Polling...")
+        await application.updater.start_polling(allowed_updates=Update.ALL_TYPES)
+    
+    # SIGTERM (docker stop, systemd) would otherwise kill the process before
+    # the finally block flushes pending DB writes and closes the HTTP pool
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop_event.set)
+        except (NotImplementedError, RuntimeError):
+            pass # Windows: KeyboardInterrupt still lands in the handler below
     
     try:
-        # Keep application running
-        while True:
-            await asyncio.sleep(3600)
+        # Keep application running until a stop signal arrives
+        await stop_event.wait()
+        logger.info("Stop signal received...")
     except (asyncio.CancelledError, KeyboardInterrupt):
         logger.info("Stop signal received...")
     finally:
@@ -525,6 +779,9 @@ async def main():
         except Exception: pass
         
         await bot_logic.shutdown()
+        if health_server:
+            health_server.close()
+            await health_server.wait_closed()
         logger.info("System Shutdown Complete.")
 
 if __name__ == "__main__":
@@ -7,6 +7,9 @@ from datetime import datetime, timedelta, timezone
 
 logger = logging.getLogger("MetricsTracker")
 
+WINDOW_HOURS = 24
+DISK_POLL_SECONDS = 60
+
 class MetricsTracker:
     """
     Central Nervous System for Bot Health.
@@ -27,9 +30,19 @@ class MetricsTracker:
         self._initialized = True
         self._start_time = time.time()
         
-        # Request Metrics (Bucketed by hour timestamp)
-        # Structure: {timestamp: {"success": int, "fail": int, "count": int}}
-        self._buckets: Dict[int, Dict[str, int]] = {} 
+        # Request Metrics (24h ring of hourly slots, indexed by hour % 24)
+        # Structure: [hour_ts, success, fail, count]; a stale hour_ts marks a slot for reuse
+        self._buckets: List[List[int]] = [[0, 0, 0, 0] for _ in range(WINDOW_HOURS)]
+        
+        # Running 24h totals, kept in step with the ring
+        self._window_total = 0
+        self._window_success = 0
+        self._retired_through = int(self._start_time // 3600) - WINDOW_HOURS
+        
+        # Slot of the hour currently being recorded, valid for [_hour_start, _hour_end)
+        self._cur_bucket: List[int] = self._buckets[0]
+        self._hour_start = 0.0
+        self._hour_end = 0.0
         
         # Latency (Global average for simplicity of trend)
         self._total_latency = 0.0
@@ -41,6 +54,10 @@ class MetricsTracker:
         # Worker Stats
         self._active_workers = 0
         self._total_workers = 0
+        
+        # Free disk space, re-probed at most every DISK_POLL_SECONDS
+        self._disk_free_mb = 0
+        self._disk_checked_at = float("-inf")
 
     def record_request(self, latency: float, success: bool):
         """
@@ -50,28 +67,60 @@ class MetricsTracker:
         self._total_latency += latency
         self._request_count += 1
         
-        # Update 24h Window Buckets
+        # Update 24h Window Buckets (slot lookup only when the hour changes)
         now = time.time()
-        hour_ts = int(now // 3600) * 3600
-        
-        if hour_ts not in self._buckets:
-            self._buckets[hour_ts] = {"success": 0, "fail": 0, "count": 0}
-            
-        # Prune old buckets (> 24h)
-        cutoff = now - (24 * 3600)
-        # Using list(keys) to allow modification during iteration if needed, 
-        # though we just iterate to find ones to delete.
-        to_remove = [ts for ts in self._buckets if ts < cutoff]
-        for ts in to_remove:
-            del self._buckets[ts]
+        if not self._hour_start <= now < self._hour_end:
+            self._open_hour(int(now // 3600))
+        bucket = self._cur_bucket
             
         # Record stats
-        bucket = self._buckets[hour_ts]
-        bucket["count"] += 1
+        bucket[3] += 1
+        self._window_total += 1
         if success:
-            bucket["success"] += 1
+            bucket[1] += 1
+            self._window_success += 1
         else:
-            bucket["fail"] += 1
+            bucket[2] += 1
+
+    def _open_hour(self, hour: int):
+        """
+        Makes `hour`'s ring slot the current one for record_request.
+        """
+        hour_ts = hour * 3600
+        self._retire_stale(hour)
+        
+        # The slot last held the same hour a day (or more) ago: recycle it
+        bucket = self._buckets[hour % WINDOW_HOURS]
+        if bucket[0] != hour_ts:
+            self._retire(bucket)
+            bucket[0] = hour_ts
+        self._cur_bucket = bucket
+        self._hour_start = hour_ts
+        self._hour_end = hour_ts + 3600
+
+    def _retire(self, bucket: List[int]):
+        """
+        Removes a slot's counts from the running totals and clears it.
+        """
+        self._window_total -= bucket[3]
+        self._window_success -= bucket[1]
+        bucket[:] = [0, 0, 0, 0]
+
+    def _retire_stale(self, hour: int):
+        """
+        Retires every hour that has left the window since the last call.
+        Each hour is visited once, so this is amortized O(1).
+        """
+        newest_stale = hour - WINDOW_HOURS
+        if newest_stale <= self._retired_through:
+            return
+        stale_ts = newest_stale * 3600
+        # After a gap of a day or more, one pass over the ring covers every slot
+        for h in range(max(self._retired_through + 1, newest_stale - WINDOW_HOURS + 1), newest_stale + 1):
+            bucket = self._buckets[h % WINDOW_HOURS]
+            if bucket[3] and bucket[0] <= stale_ts:
+                self._retire(bucket)
+        self._retired_through = newest_stale
 
     def record_db_operation(self, latency: float):
         """
@@ -93,11 +142,9 @@ class MetricsTracker:
         now = time.time()
         
         # Calculate Success Rate (24h)
-        total_reqs = 0
-        total_success = 0
-        for b in self._buckets.values():
-            total_reqs += b["count"]
-            total_success += b["success"]
+        self._retire_stale(int(now // 3600))
+        total_reqs = self._window_total
+        total_success = self._window_success
             
         success_rate = (total_success / total_reqs * 100) if total_reqs > 0 else 100.0
         
@@ -108,11 +155,7 @@ class MetricsTracker:
         avg_db_latency = (sum(self._db_write_latencies) / len(self._db_write_latencies)) if self._db_write_latencies else 0.0
         
         # Disk Space
-        try:
-            total, used, free = shutil.disk_usage(".")
-            free_mb = free // (1024 * 1024)
-        except Exception:
-            free_mb = 0
+        free_mb = self._get_disk_free_mb()
         
         # Alerts
         alerts = []
@@ -141,6 +184,21 @@ class MetricsTracker:
             "alerts": alerts
         }
 
+    def _get_disk_free_mb(self) -> int:
+        """
+        Free space of the working directory in MB, cached for DISK_POLL_SECONDS
+        (disk_usage is a slow syscall on overlay filesystems).
+        """
+        now = time.monotonic()
+        if now - self._disk_checked_at >= DISK_POLL_SECONDS:
+            try:
+                total, used, free = shutil.disk_usage(".")
+                self._disk_free_mb = free // (1024 * 1024)
+            except Exception:
+                self._disk_free_mb = 0
+            self._disk_checked_at = now
+        return self._disk_free_mb
+
 # Global Accessor
 def get_metrics_tracker() -> MetricsTracker:
     return MetricsTracker()
@@ -1,10 +1,25 @@
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Any
 from enum import Enum
-from datetime import datetime, timezone
 import zlib
 import base64
 import json
+import time
+
+# (epoch second, "YYYY-MM-DDTHH:MM:SS") of the last utcnow_iso() call
+_iso_second = (None, "")
+
+def utcnow_iso() -> str:
+    """
+    Current UTC time as ISO 8601 with microseconds (what
+    datetime.now(timezone.utc).isoformat() returns, without building a
+    datetime). The date/time prefix is formatted once per second.
+    """
+    global _iso_second
+    sec, ns = divmod(time.time_ns(), 1_000_000_000)
+    if sec != _iso_second[0]:
+        _iso_second = (sec, time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(sec)))
+    return f"{_iso_second[1]}.{ns // 1000:06d}+00:00"
 
 class ChangeType(str, Enum):
     UI_TWEAK = "UI_TWEAK"
@@ -12,14 +27,14 @@ class ChangeType(str, Enum):
     MAJOR_OVERHAUL = "MAJOR_OVERHAUL"
     INITIAL_BASELINE = "INITIAL_BASELINE"
 
-@dataclass
+@dataclass(slots=True)
 class SimilarityMetrics:
     jaccard: float = 0.0
     levenshtein: float = 0.0
     semantic: float = 0.0
     final_score: float = 0.0
 
-@dataclass
+@dataclass(slots=True)
 class WeightedFingerprint:
     hash: str
     version: str = "v2.0"
@@ -27,6 +42,17 @@ class WeightedFingerprint:
     content_weights: Dict[str, float] = field(default_factory=dict)
     structure_signature: str = ""
 
+    def to_dict(self) -> dict:
+        return {
+            "hash": self.hash,
+            "version": self.version,
+            "algorithm": self.algorithm,
+            "content_weights": dict(self.content_weights),
+            "structure_signature": self.structure_signature,
+        }
+
+_FINGERPRINT_FIELDS = frozenset(WeightedFingerprint.__slots__)
+
 @dataclass
 class ForensicSnapshot:
     timestamp: str  # ISO 8601 UTC
@@ -42,7 +68,7 @@ class ForensicSnapshot:
         b64_str = base64.b64encode(compressed_data).decode('ascii')
         
         return cls(
-            timestamp=datetime.now(timezone.utc).isoformat(),
+            timestamp=utcnow_iso(),
             change_type=change_type,
             compressed_content=b64_str
         )
@@ -55,7 +81,14 @@ class ForensicSnapshot:
         except Exception as e:
             return f"[Error Decompressing Snapshot: {e}]"
 
-@dataclass
+    def to_dict(self) -> dict:
+        return {
+            "timestamp": self.timestamp,
+            "change_type": self.change_type,
+            "compressed_content": self.compressed_content,
+        }
+
+@dataclass(slots=True)
 class Config:
     similarity_threshold: float = 0.85
     check_interval: int = 60
@@ -71,9 +104,14 @@ class Config:
             self.similarity_threshold = max(0.01, min(1.0, self.similarity_threshold))
             
     def to_dict(self) -> dict:
-        return asdict(self)
+        return {
+            "similarity_threshold": self.similarity_threshold,
+            "check_interval": self.check_interval,
+            "include_diff": self.include_diff,
+            "custom_selector": self.custom_selector,
+        }
 
-@dataclass
+@dataclass(slots=True)
 class HistoryEntry:
     timestamp: str  # ISO 8601 UTC
     change_type: str
@@ -81,9 +119,14 @@ class HistoryEntry:
     summary: str
     
     def to_dict(self) -> dict:
-        return asdict(self)
+        return {
+            "timestamp": self.timestamp,
+            "change_type": self.change_type,
+            "similarity_score": self.similarity_score,
+            "summary": self.summary,
+        }
 
-@dataclass
+@dataclass(slots=True)
 class MonitorMetadata:
     created_at: str  # ISO 8601 UTC
     last_check: Optional[str] = None
@@ -92,35 +135,72 @@ class MonitorMetadata:
     circuit_breaker_state: str = "CLOSED"
     rate_limit_count: int = 0
     snooze_until: Optional[str] = None
+    etag: Optional[str] = None  # Validators from the last 200 response
+    last_modified: Optional[str] = None
+    content_digest: Optional[str] = None  # BLAKE2b-128 of the last fingerprinted body
+    adaptive_interval: Optional[int] = None  # Backed-off check interval (seconds) while the page stays unchanged
 
-@dataclass
+    def to_dict(self) -> dict:
+        return {
+            "created_at": self.created_at,
+            "last_check": self.last_check,
+            "check_count": self.check_count,
+            "failure_count": self.failure_count,
+            "circuit_breaker_state": self.circuit_breaker_state,
+            "rate_limit_count": self.rate_limit_count,
+            "snooze_until": self.snooze_until,
+            "etag": self.etag,
+            "last_modified": self.last_modified,
+            "content_digest": self.content_digest,
+            "adaptive_interval": self.adaptive_interval,
+        }
+
+@dataclass(slots=True)
 class Monitor:
     url: str
     fingerprint: Optional[WeightedFingerprint] = None
-    metadata: MonitorMetadata = field(default_factory=lambda: MonitorMetadata(created_at=datetime.now(timezone.utc).isoformat()))
+    metadata: MonitorMetadata = field(default_factory=lambda: MonitorMetadata(created_at=utcnow_iso()))
     forensic_snapshots: List[ForensicSnapshot] = field(default_factory=list)
     history_log: List[HistoryEntry] = field(default_factory=list)
     history_archive: List[str] = field(default_factory=list) # Base64 encoded zlib compressed JSON lists
     config: Optional[Config] = None # Per-monitor override
     
     def to_dict(self) -> dict:
-        return asdict(self)
+        # Explicit literals: asdict() deep-copies every nested field
+        return {
+            "url": self.url,
+            "fingerprint": self.fingerprint.to_dict() if self.fingerprint else None,
+            "metadata": self.metadata.to_dict(),
+            "forensic_snapshots": [s.to_dict() for s in self.forensic_snapshots],
+            "history_log": [h.to_dict() for h in self.history_log],
+            "history_archive": list(self.history_archive),
+            "config": self.config.to_dict() if self.config else None,
+        }
     
     @classmethod
     def from_dict(cls, data: dict) -> 'Monitor':
         # Defensive reconstruction
         fp_data = data.get("fingerprint")
-        fp = WeightedFingerprint(**fp_data) if fp_data else None
+        # Unknown keys (e.g. the dropped simhash/content_length) are ignored
+        fp = WeightedFingerprint(**{k: v for k, v in fp_data.items() if k in _FINGERPRINT_FIELDS}) if fp_data else None
         
         meta_data = data.get("metadata", {})
         if not meta_data:
-             meta_data = {"created_at": datetime.now(timezone.utc).isoformat()}
+             meta_data = {"created_at": utcnow_iso()}
         meta = MonitorMetadata(**meta_data)
         
-        snapshots = [ForensicSnapshot(**s) for s in data.get("forensic_snapshots", [])]
+        # Per-row models are built positionally (no kwargs dict per row);
+        # their field sets are fixed, unlike the evolving metadata/fingerprint
+        snapshots = [
+            ForensicSnapshot(s["timestamp"], s["change_type"], s["compressed_content"])
+            for s in data.get("forensic_snapshots", [])
+        ]
         
         hist_data = data.get("history_log", [])
-        history = [HistoryEntry(**h) for h in hist_data]
+        history = [
+            HistoryEntry(h["timestamp"], h["change_type"], h["similarity_score"], h["summary"])
+            for h in hist_data
+        ]
         
         archive = data.get("history_archive", [])
         
@@ -143,4 +223,41 @@ class UserData:
     monitors: List[Monitor] = field(default_factory=list)
 
     def to_dict(self) -> dict:
-        return asdict(self)
+        return {
+            "user_config": self.user_config.to_dict(),
+            "monitors": [m.to_dict() for m in self.monitors],
+        }
+
+    def _url_index(self) -> Dict[str, Monitor]:
+        """
+        url -> Monitor lookup table over `monitors`. Rebuilt lazily whenever
+        the list object is swapped or its length changes behind our back;
+        upsert/remove keep it in sync themselves.
+        """
+        if (self.__dict__.get("_indexed") is not self.monitors
+                or self.__dict__.get("_indexed_len") != len(self.monitors)):
+            self.__dict__["_index"] = {m.url: m for m in self.monitors}
+            self.__dict__["_indexed"] = self.monitors
+            self.__dict__["_indexed_len"] = len(self.monitors)
+        return self.__dict__["_index"]
+
+    def get_monitor(self, url: str) -> Optional[Monitor]:
+        """O(1) lookup of a watched URL."""
+        return self._url_index().get(url)
+
+    def upsert_monitor(self, monitor: Monitor):
+        """Adds a monitor, replacing any existing one for the same URL."""
+        self.remove_monitor(monitor.url)
+        index = self._url_index()
+        self.monitors.append(monitor)
+        index[monitor.url] = monitor
+        self.__dict__["_indexed_len"] = len(self.monitors)
+
+    def remove_monitor(self, url: str) -> Optional[Monitor]:
+        """Removes and returns the monitor for `url` (None if not watched)."""
+        index = self._url_index()
+        existing = index.pop(url, None)
+        if existing is not None:
+            self.monitors.remove(existing)
+            self.__dict__["_indexed_len"] = len(self.monitors)
+        return existing
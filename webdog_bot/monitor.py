@@ -8,7 +8,7 @@ from bs4 import BeautifulSoup
 async def get_website_fingerprint(url: str) -> str:
     """
     Downloads the page, strips out dynamic junk (scripts/styles),
-    and returns a unique hash (MD5) of the text content.
+    and returns a unique hash (BLAKE2b-128) of the text content.
     """
     try:
         # Use aiohttp for async requests (faster than requests library)
@@ -32,7 +32,7 @@ async def get_website_fingerprint(url: str) -> str:
                 text = soup.get_text(separator=" ", strip=True)
                 
                 # Generate a hash so we don't have to store the whole page text
-                return hashlib.md5(text.encode("utf-8")).hexdigest()
+                return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
                 
     except Exception as e:
         logging.error(f"Something went wrong while fingerprinting {url}: {e}")
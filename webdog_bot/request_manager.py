@@ -4,7 +4,9 @@ import urllib.parse
 import logging
 import httpx
 import random
+from functools import lru_cache
 from typing import Dict, Tuple, Optional
+from collections import OrderedDict
 from dataclasses import dataclass
 from urllib.robotparser import RobotFileParser
 
@@ -20,15 +22,62 @@ HARD_TIMEOUT = 15.0 # seconds
 MIN_JITTER = 1.0 # seconds
 MAX_JITTER = 5.0 # seconds
 
+# Size bounds for the manager's lookup tables (oldest / least recently used evicted)
+MAX_CACHED_RESULTS = 256   # entries hold whole page bodies
+MAX_CIRCUITS = 4096
+MAX_ROBOTS_ENTRIES = 1024
+
+# Query parameters dropped from de-duplication keys
+TRACKING_PARAMS = frozenset({'utm_source', 'utm_medium', 'utm_campaign', 'utm_term', 'utm_content', 'fbclid', 'gclid'})
+
+# Response bodies are streamed in chunks and capped to bound memory
+STREAM_CHUNK_SIZE = 65536
+MAX_BODY_BYTES = 5 * 1024 * 1024
+
+# Connection pool sizing for the shared client
+MAX_CONNECTIONS = 100
+MAX_KEEPALIVE_CONNECTIONS = 100 # ~one warm connection per watched host between ticks
+# httpx drops idle connections after 5s by default, i.e. long before the next
+# 60s patrol tick; keep them long enough to be reused across ticks.
+KEEPALIVE_EXPIRY = 75.0 # seconds
+
+# HTTP/2 multiplexing needs the optional `h2` package (httpx[http2])
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
 logger = logging.getLogger("GlobalRequestManager")
 
-@dataclass
+@lru_cache(maxsize=4096)
+def _normalize_url(url: str) -> str:
+    """Memoized body of GlobalRequestManager.normalize_url (pure in `url`)."""
+    parsed = urllib.parse.urlparse(url)
+    pairs = [
+        (k, v) for k, v in urllib.parse.parse_qsl(parsed.query, keep_blank_values=True)
+        if k not in TRACKING_PARAMS
+    ]
+    pairs.sort(key=lambda kv: kv[0]) # Stable: repeated keys keep their order
+    
+    return urllib.parse.urlunparse((
+        parsed.scheme.lower(),
+        parsed.netloc.lower(),
+        parsed.path,
+        parsed.params,
+        urllib.parse.urlencode(pairs),
+        parsed.fragment
+    ))
+
+@dataclass(slots=True, frozen=True)
 class FetchResult:
     url: str
     content: Optional[str]
     status_code: int
     error: Optional[str] = None
     timestamp: float = 0.0
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
 
 class FetchTimeoutError(Exception):
     """Raised when a fetch operation exceeds the hard timeout."""
@@ -50,21 +99,38 @@ class GlobalRequestManager:
         # normalize_url -> Future[FetchResult]
         self._active_requests: Dict[str, asyncio.Future] = {}
         
-        # normalized_url -> (FetchResult, timestamp)
+        # normalized_url -> (FetchResult, timestamp), in insertion (= age) order
         self._cache: Dict[str, Tuple[FetchResult, float]] = {}
         
-        # normalized_url -> CircuitBreaker
-        self._circuits: Dict[str, CircuitBreaker] = {}
+        # normalized_url -> CircuitBreaker (LRU)
+        self._circuits: "OrderedDict[str, CircuitBreaker]" = OrderedDict()
         
-        # normalized_domain -> RobotFileParser
-        self._robots_cache: Dict[str, RobotFileParser] = {}
+        # normalized_domain -> RobotFileParser (LRU)
+        self._robots_cache: "OrderedDict[str, RobotFileParser]" = OrderedDict()
+        # normalized_domain -> Future[RobotFileParser] while robots.txt is being fetched
+        self._robots_inflight: Dict[str, asyncio.Future] = {}
         
-        # self._client will be initialized in startup()
-        self._client: Optional[httpx.AsyncClient] = None
+        # One pooled client for the manager's lifetime so TCP/TLS
+        # connections are reused across fetches and patrol ticks.
+        self._client: Optional[httpx.AsyncClient] = self._build_client()
+
+    def _build_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            verify=False,
+            follow_redirects=True,
+            timeout=HARD_TIMEOUT,
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(
+                max_connections=MAX_CONNECTIONS,
+                max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=KEEPALIVE_EXPIRY
+            )
+        )
 
     async def startup(self):
-        """Initializes the HTTP client."""
-        self._client = httpx.AsyncClient(verify=False, follow_redirects=True, timeout=HARD_TIMEOUT)
+        """Initializes the HTTP client (re-creates it after close())."""
+        if self._client is None or self._client.is_closed:
+            self._client = self._build_client()
 
 
     async def close(self):
@@ -72,31 +138,36 @@ class GlobalRequestManager:
             await self._client.aclose()
         
     def _get_circuit(self, key: str) -> CircuitBreaker:
-        if key not in self._circuits:
-            self._circuits[key] = CircuitBreaker(failure_threshold=3, recovery_timeout=3600)
-        return self._circuits[key]
+        cb = self._circuits.get(key)
+        if cb is None:
+            cb = self._circuits[key] = CircuitBreaker(failure_threshold=3, recovery_timeout=3600)
+            if len(self._circuits) > MAX_CIRCUITS:
+                self._circuits.popitem(last=False)
+        else:
+            self._circuits.move_to_end(key)
+        return cb
+
+    def _cache_result(self, key: str, result: FetchResult):
+        """
+        Caches a result, then drops expired entries and, past
+        MAX_CACHED_RESULTS, the oldest ones (they hold whole page bodies).
+        """
+        now = time.time()
+        self._cache.pop(key, None)
+        self._cache[key] = (result, now)
+        while self._cache:
+            oldest = next(iter(self._cache))
+            if now - self._cache[oldest][1] < CACHE_TTL and len(self._cache) <= MAX_CACHED_RESULTS:
+                break
+            del self._cache[oldest]
 
     def normalize_url(self, url: str) -> str:
         """
         Strips tracking parameters to ensure clean de-duplication keys.
+        Scheme and host are case-folded; path and query keep their case
+        since servers may treat them case-sensitively.
         """
-        parsed = urllib.parse.urlparse(url)
-        query = urllib.parse.parse_qs(parsed.query)
-        
-        tracking_params = {'utm_source', 'utm_medium', 'utm_campaign', 'utm_term', 'utm_content', 'fbclid', 'gclid'}
-        clean_query = {k: v for k, v in query.items() if k not in tracking_params}
-        sorted_query = urllib.parse.urlencode(clean_query, doseq=True)
-        
-        clean_url = urllib.parse.urlunparse((
-            parsed.scheme,
-            parsed.netloc,
-            parsed.path,
-            parsed.params,
-            sorted_query,
-            parsed.fragment
-        ))
-        
-        return clean_url.lower()
+        return _normalize_url(url)
 
     async def can_fetch(self, url: str, user_agent: str = "*") -> bool:
         """
@@ -106,7 +177,15 @@ class GlobalRequestManager:
         base_url = f"{parsed.scheme}://{parsed.netloc}"
         robots_url = f"{base_url}/robots.txt"
         
-        if base_url not in self._robots_cache:
+        parser = self._robots_cache.get(base_url)
+        if parser is not None:
+            self._robots_cache.move_to_end(base_url)
+        elif base_url in self._robots_inflight:
+            # Another fetch for this domain is already loading robots.txt
+            parser = await asyncio.shield(self._robots_inflight[base_url])
+        else:
+            future = asyncio.get_running_loop().create_future()
+            self._robots_inflight[base_url] = future
             parser = RobotFileParser()
             try:
                 # We fetch robots.txt with a short timeout
@@ -118,31 +197,43 @@ class GlobalRequestManager:
             except Exception:
                 # If robots.txt fails, usually assume allow or allow_all
                 parser.allow_all = True
+            except asyncio.CancelledError:
+                # Don't leave waiters holding an empty (deny-all) parser
+                parser.allow_all = True
+                raise
+            finally:
+                del self._robots_inflight[base_url]
+                future.set_result(parser)
                 
             self._robots_cache[base_url] = parser
+            if len(self._robots_cache) > MAX_ROBOTS_ENTRIES:
+                self._robots_cache.popitem(last=False)
             
-        return self._robots_cache[base_url].can_fetch(user_agent, url)
+        return parser.can_fetch(user_agent, url)
 
 
 
 # ...
 
-    async def fetch(self, url: str) -> FetchResult:
+    async def fetch(self, url: str, etag: Optional[str] = None, last_modified: Optional[str] = None) -> FetchResult:
         """
         Fetch a URL with de-duplication, caching, circuit protection, robots compliance, and jitter.
+        If etag/last_modified are given the request is conditional and may
+        come back as a body-less 304.
         """
         normalized_url = self.normalize_url(url)
         now = time.time()
         
-        # 0. Global Rate Limiter (Token Bucket)
-        # We wait for token BEFORE doing anything expensive or queuing jitter.
-        # This acts as the "prioritized queue" entry gate implicitly via asyncio locking.
-        await get_governor().acquire_web_token()
-        
-        # 0.5 Jitter
-        delay = random.uniform(MIN_JITTER, MAX_JITTER)
-        logger.debug(f"Applying jitter {delay:.2f}s for {url}")
-        await asyncio.sleep(delay)
+        # Conditional requests get their own cache/de-dup slot so a 304 is
+        # never handed to a caller that needs the body.
+        validators = {}
+        if etag:
+            validators["If-None-Match"] = etag
+        if last_modified:
+            validators["If-Modified-Since"] = last_modified
+        request_key = normalized_url
+        if validators:
+            request_key = f"{normalized_url}|{etag or ''}|{last_modified or ''}"
         
         # 1. Circuit Breaker Check
         cb = self._get_circuit(normalized_url)
@@ -155,46 +246,57 @@ class GlobalRequestManager:
             return FetchResult(url, None, 0, error=err_msg, timestamp=now)
         
         # 2. Check Cache
-        if normalized_url in self._cache:
-            result, ts = self._cache[normalized_url]
+        if request_key in self._cache:
+            result, ts = self._cache[request_key]
             if now - ts < CACHE_TTL:
                 logger.debug(f"[Cache Hit] {normalized_url}")
                 # Cache hit is "instant" success
                 get_metrics_tracker().record_request(0, True)
                 return result
             else:
-                del self._cache[normalized_url] # Expired
+                del self._cache[request_key] # Expired
         
         # 3. Check Active Requests
-        if normalized_url in self._active_requests:
+        if request_key in self._active_requests:
             logger.debug(f"[Collapsing Request] Waiting for active fetch: {normalized_url}")
             # Collapsed request waits for real one. Timer starts now for *this* caller?
             # Or share result?
             # Let's not double count collapsed requests for network metrics, 
             # but for "Service Level" metrics we might. 
             # For simplicity, we only measure *actual* fetches initiated by this manager.
-            return await self._active_requests[normalized_url]
+            return await self._active_requests[request_key]
             
         # 4. New Request
         future = asyncio.get_running_loop().create_future()
-        self._active_requests[normalized_url] = future
+        self._active_requests[request_key] = future
         
-        # Start Timer for Network Call
         start_time = time.time()
         success = False
         
         try:
+            # 4.5 Global Rate Limiter (Token Bucket) + Jitter
+            # Only requests that will hit the network wait here; cache hits and
+            # collapsed callers have already returned. Duplicates arriving
+            # meanwhile collapse onto the future registered above.
+            await get_governor().acquire_web_token()
+            delay = random.uniform(MIN_JITTER, MAX_JITTER)
+            logger.debug(f"Applying jitter {delay:.2f}s for {url}")
+            await asyncio.sleep(delay)
+            
+            # Start Timer for Network Call
+            start_time = time.time()
+            
             # 5. Robots.txt Compliance
             if not await self.can_fetch(url, "*"):
                  raise Exception("Blocked by Robots.txt directive")
 
             # Hard Timeout Wrapper
             result = await asyncio.wait_for(
-                self._execute_http_request(url, normalized_url, cb), 
+                self._execute_http_request(url, normalized_url, cb, validators), 
                 timeout=HARD_TIMEOUT
             )
             
-            self._cache[normalized_url] = (result, time.time())
+            self._cache_result(request_key, result)
             
             if not future.done():
                 future.set_result(result)
@@ -229,30 +331,62 @@ class GlobalRequestManager:
             duration = time.time() - start_time
             get_metrics_tracker().record_request(duration, success)
             
-            if normalized_url in self._active_requests:
-                del self._active_requests[normalized_url]
+            if request_key in self._active_requests:
+                del self._active_requests[request_key]
+            if not future.done():
+                # Cancelled mid-fetch: release collapsed callers instead of stranding them
+                future.set_result(FetchResult(url, None, 0, error="Fetch cancelled", timestamp=time.time()))
 
-    async def _execute_http_request(self, original_url: str, normalized_key: str, cb: CircuitBreaker) -> FetchResult:
+    async def _execute_http_request(self, original_url: str, normalized_key: str, cb: CircuitBreaker, validators: Optional[Dict[str, str]] = None) -> FetchResult:
         """
         Performs network call and updates Circuit Breaker state.
         """
         headers = get_random_headers()
+        if validators:
+            headers.update(validators)
         try:
             logger.info(f"[Network Call] Fetching {original_url}...")
-            resp = await self._client.get(original_url, headers=headers)
-            
-            # Circuit Logic
-            if resp.status_code >= 500 or resp.status_code == 429:
-                cb.record_failure()
-            else:
-                cb.record_success()
+            request = self._client.build_request("GET", original_url, headers=headers)
+            resp = await self._client.send(request, stream=True)
+            try:
+                # Circuit Logic
+                if resp.status_code >= 500 or resp.status_code == 429:
+                    cb.record_failure()
+                else:
+                    cb.record_success()
+
+                if resp.status_code == 304:
+                    # Unchanged since the validators were issued; no body to read
+                    return FetchResult(original_url, None, 304, timestamp=time.time())
+
+                # Stream the body so oversized pages never sit fully in memory
+                body = bytearray()
+                async for chunk in resp.aiter_bytes(STREAM_CHUNK_SIZE):
+                    body.extend(chunk)
+                    if len(body) >= MAX_BODY_BYTES:
+                        logger.warning(f"Body of {original_url} exceeds {MAX_BODY_BYTES} bytes; truncating.")
+                        del body[MAX_BODY_BYTES:]
+                        break
+            finally:
+                await resp.aclose()
 
             return FetchResult(
                 url=original_url,
-                content=resp.text,
+                content=self._decode_body(body, resp.charset_encoding),
                 status_code=resp.status_code,
-                timestamp=time.time()
+                timestamp=time.time(),
+                etag=resp.headers.get("ETag"),
+                last_modified=resp.headers.get("Last-Modified")
             )
         except httpx.RequestError as e:
             cb.record_failure()
             return FetchResult(original_url, None, 0, error=str(e), timestamp=time.time())
+
+    @staticmethod
+    def _decode_body(body: bytearray, charset: Optional[str]) -> str:
+        """Decodes a streamed body using the declared charset (UTF-8 otherwise)."""
+        try:
+            return body.decode(charset or "utf-8", errors="replace")
+        except LookupError:
+            # Unknown charset label in Content-Type
+            return body.decode("utf-8", errors="replace")
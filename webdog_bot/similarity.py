@@ -1,11 +1,25 @@
 import difflib
 import logging
+import re
+from bisect import bisect_right
+from collections import Counter
 from typing import Set, List, Dict
-from bs4 import BeautifulSoup
 from models import SimilarityMetrics, ChangeType, WeightedFingerprint
 
+# RapidFuzz computes the same ratio with a bit-parallel C++ kernel; used if
+# installed, not required (compare_content is off the patrol path)
+try:
+    from rapidfuzz.distance import Indel
+except ImportError:
+    Indel = None
+
 logger = logging.getLogger("SimilarityEngine")
 
+# Opening tags of the structural elements counted by compute_semantic_structure
+_STRUCTURE_TAG_RE = re.compile(
+    r'<(div|p|span|h1|h2|h3|table|ul|li|article|section|nav)(?=[\s/>])', re.IGNORECASE
+)
+
 class SimilarityEngine:
     """
     Multi-algorithm content comparison engine.
@@ -22,16 +36,20 @@ class SimilarityEngine:
     # Thresholds for classification
     THRESHOLD_UI_TWEAK = 0.95
     THRESHOLD_CONTENT_UPDATE = 0.70
+    # classify_change lookup: scores below/between/above the two thresholds
+    _CHANGE_BOUNDS = (THRESHOLD_CONTENT_UPDATE, THRESHOLD_UI_TWEAK)
+    _CHANGE_TYPES = (ChangeType.MAJOR_OVERHAUL, ChangeType.CONTENT_UPDATE, ChangeType.UI_TWEAK)
 
     def compute_jaccard(self, text1: str, text2: str) -> float:
         """
         Calculates Jaccard similarity index (intersection over union) of words.
         """
-        set1 = set(text1.lower().split())
-        set2 = set(text2.lower().split())
+        set1 = frozenset(text1.lower().split())
+        set2 = frozenset(text2.lower().split())
         
-        intersection = len(set1.intersection(set2))
-        union = len(set1.union(set2))
+        # |A u B| = |A| + |B| - |A n B|; no need to build the union set
+        intersection = len(set1 & set2)
+        union = len(set1) + len(set2) - intersection
         
         if union == 0:
             return 1.0 # Both empty -> identical
@@ -41,8 +59,12 @@ class SimilarityEngine:
     def compute_levenshtein(self, text1: str, text2: str) -> float:
         """
         Calculates Levenshtein ratio (similarity) between 0.0 and 1.0.
-        Uses difflib.SequenceMatcher for efficient calculation.
+        Uses RapidFuzz's Indel similarity when installed, else difflib.SequenceMatcher.
         """
+        if text1 == text2:
+            return 1.0
+        if Indel is not None:
+            return Indel.normalized_similarity(text1, text2)
         return difflib.SequenceMatcher(None, text1, text2).ratio()
 
     def compute_semantic_structure(self, html1: str, html2: str) -> float:
@@ -51,13 +73,8 @@ class SimilarityEngine:
         Returns a similarity score based on how close the tag counts are.
         """
         def get_structure_map(html: str) -> Dict[str, int]:
-            soup = BeautifulSoup(html, 'html.parser')
-            counts = {}
-            # We care about structural tags
-            tags_of_interest = ['div', 'p', 'span', 'h1', 'h2', 'h3', 'table', 'ul', 'li', 'article', 'section', 'nav']
-            for tag in soup.find_all(tags_of_interest):
-                counts[tag.name] = counts.get(tag.name, 0) + 1
-            return counts
+            # Only tag-name frequencies are needed, so scan the markup instead of building a DOM
+            return Counter(name.lower() for name in _STRUCTURE_TAG_RE.findall(html))
             
         map1 = get_structure_map(html1)
         map2 = get_structure_map(html2)
@@ -89,6 +106,10 @@ class SimilarityEngine:
         """
         Orchestrates the multi-algorithm comparison.
         """
+        if old_text == new_text and old_html == new_html:
+            # Unchanged page: every metric is 1.0, skip the O(n*m) work
+            return SimilarityMetrics(jaccard=1.0, levenshtein=1.0, semantic=1.0, final_score=1.0)
+
         jaccard = self.compute_jaccard(old_text, new_text)
         levenshtein = self.compute_levenshtein(old_text, new_text)
         semantic = self.compute_semantic_structure(old_html, new_html)
@@ -110,12 +131,7 @@ class SimilarityEngine:
         """
         Determines the magnitude of the change.
         """
-        if score >= self.THRESHOLD_UI_TWEAK:
-            return ChangeType.UI_TWEAK
-        elif score >= self.THRESHOLD_CONTENT_UPDATE:
-            return ChangeType.CONTENT_UPDATE
-        else:
-            return ChangeType.MAJOR_OVERHAUL
+        return self._CHANGE_TYPES[bisect_right(self._CHANGE_BOUNDS, score)]
 
     def should_alert(self, score: float, user_threshold: float) -> bool:
         """
@@ -0,0 +1,45 @@
+import logging
+
+import httpcore
+import httpx
+from httpcore.backends.auto import AutoBackend
+from telegram.request import HTTPXRequest
+
+logger = logging.getLogger("TelegramRequest")
+
+TELEGRAM_API_HOST = "api.telegram.org"
+# Direct routing to Telegram API (Amsterdam/London Datacenter)
+# 149.154.167.220 is the stable IP for api.telegram.org
+TELEGRAM_API_IP = "149.154.167.220"
+
+class PinnedTelegramBackend(AutoBackend):
+    """
+    Network backend that dials TELEGRAM_API_IP for api.telegram.org.
+    This bypasses OS-level resolver failures in restricted Docker environments.
+    TLS still runs against the request's hostname, so SNI and certificate
+    checks are unaffected.
+    """
+    async def connect_tcp(self, host, port, timeout=None, local_address=None):
+        if host == TELEGRAM_API_HOST:
+            host = TELEGRAM_API_IP
+        return await super().connect_tcp(host, port, timeout=timeout, local_address=local_address)
+
+class PinnedHTTPXRequest(HTTPXRequest):
+    """
+    PTB request backend whose connections go through PinnedTelegramBackend.
+    The pin applies to the bot's own client only; every other socket in the
+    process resolves names normally.
+    """
+    def _build_client(self) -> httpx.AsyncClient:
+        limits: httpx.Limits = self._client_kwargs["limits"]
+        transport = httpx.AsyncHTTPTransport(limits=limits)
+        # httpx 0.23 can't take a network backend directly; swap in an
+        # identically configured pool that uses ours
+        transport._pool = httpcore.AsyncConnectionPool(
+            ssl_context=httpx.create_ssl_context(),
+            max_connections=limits.max_connections,
+            max_keepalive_connections=limits.max_keepalive_connections,
+            keepalive_expiry=limits.keepalive_expiry,
+            network_backend=PinnedTelegramBackend(),
+        )
+        return httpx.AsyncClient(transport=transport, **self._client_kwargs)